@@ -0,0 +1,292 @@
+# src/_njit.py
+"""Numeric kernels compiled with numba when it is installed.
+
+numba is an optional dependency: without it `njit` is a no-op decorator and
+the kernels run as plain NumPy code with identical results.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, usable bare or with options."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Hedge fund position sizing / signals
+
+@njit(cache=True)
+def compute_trade_sizes(total_value, cash, confidence, liquidity):
+    """Position size per trade: 20% of the book scaled by confidence,
+    capped at 10% of known liquidity and at available cash."""
+    sizes = total_value * 0.2 * confidence
+    sizes = np.where(liquidity > 0, np.minimum(sizes, liquidity * 0.1), sizes)
+    return np.minimum(sizes, cash)
+
+
+@njit(cache=True)
+def signal_mask(changes_24h, prices):
+    """Fade 5% daily moves on priced tokens: returns (sells, buys) masks."""
+    tradable = prices > 0.0
+    sells = tradable & (changes_24h > 5.0)
+    buys = tradable & (changes_24h < -5.0)
+    return sells, buys
+
+
+# Market analyzer indicators (last value only, single pass, no temporaries)
+
+@njit(cache=True)
+def rsi_last(prices, period):
+    """RSI from the mean gain/loss of the last `period` price changes.
+
+    Needs `n > period` prices (a full window of changes) and otherwise
+    returns the neutral 50.0, as it does for a flat window. Unlike the old
+    `diff().where(...).rolling(period).mean()` chain, which filled the
+    leading NaN change with 0, it does not produce a value at `n == period`.
+    """
+    n = prices.shape[0]
+    if period <= 0 or n <= period:
+        return 50.0
+    gain = 0.0
+    loss = 0.0
+    for i in range(n - period, n):
+        delta = prices[i] - prices[i - 1]
+        if delta > 0.0:
+            gain += delta
+        else:
+            loss -= delta
+    if loss == 0.0:
+        return 100.0 if gain > 0.0 else 50.0
+    rs = gain / loss
+    return 100.0 - 100.0 / (1.0 + rs)
+
+
+@njit(cache=True)
+def bollinger_position_last(prices, window, num_std):
+    """Position of the last price between the last window's Bollinger bands
+    (0 = lower band, 1 = upper band, sample std); 0.5 when undefined."""
+    n = prices.shape[0]
+    if window < 2 or n < window:
+        return 0.5
+    total = 0.0
+    for i in range(n - window, n):
+        total += prices[i]
+    mean = total / window
+    sq = 0.0
+    for i in range(n - window, n):
+        d = prices[i] - mean
+        sq += d * d
+    std = np.sqrt(sq / (window - 1))
+    if std == 0.0:
+        return 0.5
+    lower = mean - num_std * std
+    return (prices[n - 1] - lower) / (2.0 * num_std * std)
+
+
+@njit(cache=True)
+def max_drawdown(prices):
+    """Most negative (price - running max) / running max over the series."""
+    running_max = -np.inf
+    min_dd = 0.0
+    for i in range(prices.shape[0]):
+        p = prices[i]
+        if p > running_max:
+            running_max = p
+        if running_max > 0.0:
+            dd = (p - running_max) / running_max
+            if dd < min_dd:
+                min_dd = dd
+    return min_dd
+
+
+@njit(cache=True, error_model='numpy')
+def pct_returns(prices):
+    """Simple returns p[i] / p[i-1] - 1, as `pct_change().dropna()`: NaN is
+    skipped, and a move off a zero price stays inf."""
+    n = prices.shape[0]
+    out = np.empty(max(n - 1, 0), dtype=np.float64)
+    k = 0
+    for i in range(1, n):
+        r = prices[i] / prices[i - 1] - 1.0
+        if not np.isnan(r):
+            out[k] = r
+            k += 1
+    return out[:k]
+
+
+@njit(cache=True)
+def macd_last(prices, fast_period, slow_period, signal_period):
+    """(macd, signal, histogram) at the last bar, using `ewm(span, adjust=False)`
+    recursions seeded with the first price, in one pass over `prices`."""
+    if prices.shape[0] == 0:
+        return 0.0, 0.0, 0.0
+    alpha_fast = 2.0 / (fast_period + 1.0)
+    alpha_slow = 2.0 / (slow_period + 1.0)
+    alpha_sig = 2.0 / (signal_period + 1.0)
+    fast_ema = prices[0]
+    slow_ema = prices[0]
+    sig_ema = 0.0
+    for i in range(1, prices.shape[0]):
+        p = prices[i]
+        fast_ema += alpha_fast * (p - fast_ema)
+        slow_ema += alpha_slow * (p - slow_ema)
+        sig_ema += alpha_sig * ((fast_ema - slow_ema) - sig_ema)
+    macd = fast_ema - slow_ema
+    return macd, sig_ema, macd - sig_ema
+
+
+@njit(cache=True, error_model='numpy')
+def all_indicators(prices, rsi_period=14, fast_period=12, slow_period=26,
+                   signal_period=9, bb_window=20, num_std=2.0, momentum_period=14):
+    """Every technical indicator in one traversal of `prices`.
+
+    Returns (rsi, macd_histogram, bollinger_position, momentum, volatility)
+    with the same definitions and fallbacks as rsi_last, macd_last and
+    bollinger_position_last; momentum is the `momentum_period`-bar return
+    and volatility the sample std of the finite one-bar returns (both 0.0 if
+    undefined). A zero price divides like NumPy, to inf or NaN, rather than
+    raising ZeroDivisionError under numba.
+    """
+    n = prices.shape[0]
+    if n == 0:
+        return 50.0, 0.0, 0.5, 0.0, 0.0
+    alpha_fast = 2.0 / (fast_period + 1.0)
+    alpha_slow = 2.0 / (slow_period + 1.0)
+    alpha_sig = 2.0 / (signal_period + 1.0)
+    fast_ema = prices[0]
+    slow_ema = prices[0]
+    sig_ema = 0.0
+    gain = 0.0
+    loss = 0.0
+    # Welford accumulators: Bollinger window prices and all one-bar returns
+    bb_count = 0
+    bb_mean = 0.0
+    bb_m2 = 0.0
+    ret_count = 0
+    ret_mean = 0.0
+    ret_m2 = 0.0
+    if n == bb_window:
+        # The Bollinger window starts at the first price, which the loop skips
+        bb_count = 1
+        bb_mean = prices[0]
+    for i in range(1, n):
+        p = prices[i]
+        prev = prices[i - 1]
+        
+        fast_ema += alpha_fast * (p - fast_ema)
+        slow_ema += alpha_slow * (p - slow_ema)
+        sig_ema += alpha_sig * ((fast_ema - slow_ema) - sig_ema)
+        
+        if i >= n - rsi_period:
+            delta = p - prev
+            if delta > 0.0:
+                gain += delta
+            else:
+                loss -= delta
+                
+        if i >= n - bb_window:
+            bb_count += 1
+            d = p - bb_mean
+            bb_mean += d / bb_count
+            bb_m2 += d * (p - bb_mean)
+            
+        r = p / prev - 1.0
+        if np.isfinite(r):
+            ret_count += 1
+            d = r - ret_mean
+            ret_mean += d / ret_count
+            ret_m2 += d * (r - ret_mean)
+            
+    if rsi_period <= 0 or n <= rsi_period:
+        rsi = 50.0
+    elif loss == 0.0:
+        rsi = 100.0 if gain > 0.0 else 50.0
+    else:
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+        
+    macd = fast_ema - slow_ema
+    
+    bb_pos = 0.5
+    if bb_window >= 2 and n >= bb_window:
+        std = np.sqrt(bb_m2 / (bb_window - 1))
+        if std > 0.0:
+            bb_pos = (prices[n - 1] - (bb_mean - num_std * std)) / (2.0 * num_std * std)
+            
+    momentum = 0.0
+    if 0 < momentum_period < n:
+        momentum = prices[n - 1] / prices[n - 1 - momentum_period] - 1.0
+        
+    volatility = 0.0
+    if ret_count > 1:
+        volatility = np.sqrt(ret_m2 / (ret_count - 1))
+        
+    return rsi, macd - sig_ema, bb_pos, momentum, volatility
+
+
+# Market scanner indicators
+
+@njit(cache=True)
+def scanner_indicators(prices, rsi_period=14, window=20, change_lag=24):
+    """The market scanner's indicators in one pass over the tail of `prices`.
+
+    Returns (sma, current, pct_change, rsi, volatility): the mean and sample
+    std of the last `window` prices (NaN / 0.0 when there are fewer), the
+    last price, the percent change over the last `change_lag` prices (0.0
+    when there are fewer), and RSI as defined by rsi_last.
+    """
+    n = prices.shape[0]
+    if n == 0:
+        return np.nan, 0.0, 0.0, 50.0, 0.0
+    start = max(n - max(window, rsi_period + 1, change_lag), 0)
+    gain = 0.0
+    loss = 0.0
+    # Welford accumulators over the last `window` prices
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(start, n):
+        p = prices[i]
+        if i >= n - rsi_period and i > 0:
+            delta = p - prices[i - 1]
+            if delta > 0.0:
+                gain += delta
+            else:
+                loss -= delta
+        if i >= n - window:
+            count += 1
+            d = p - mean
+            mean += d / count
+            m2 += d * (p - mean)
+
+    current = prices[n - 1]
+
+    sma = np.nan
+    volatility = 0.0
+    if window > 0 and n >= window:
+        sma = mean
+        if window > 1:
+            volatility = np.sqrt(m2 / (window - 1))
+
+    pct_change = 0.0
+    if change_lag > 0 and n >= change_lag:
+        past = prices[n - change_lag]
+        if past != 0.0:
+            pct_change = (current - past) / past * 100.0
+
+    if rsi_period <= 0 or n <= rsi_period:
+        rsi = 50.0
+    elif loss == 0.0:
+        rsi = 100.0 if gain > 0.0 else 50.0
+    else:
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+
+    return sma, current, pct_change, rsi, volatility
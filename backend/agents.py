@@ -2,7 +2,11 @@ import sys
 import os
 import argparse
 import asyncio
-from datetime import datetime, timedelta
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
 from typing import List
 
 # Add the parent directory to sys.path to allow imports from 'src' directory
@@ -35,6 +39,10 @@ from backend.tools import (
     prices_to_df,
 )
 
+SUPPORTED_PAIRS: frozenset[str] = frozenset({'SOL', 'BONK', 'JUP'}) # Pairs accepted by validate_args
+
+logger = logging.getLogger(__name__)
+
 
 class TradingAgent:
     """
@@ -46,6 +54,8 @@ class TradingAgent:
     It is designed to be extended with trading strategies and integrations with Solana trading platforms.
     """
 
+    _ACTIONS = ("BUY", "SELL", None) # Placeholder strategy's choices; None represents HOLD
+
     def __init__(
         self,
         capital: float,
@@ -72,8 +82,8 @@ class TradingAgent:
         self.dry_run = dry_run
         self.interval = interval
         self.show_reasoning = show_reasoning
-        self.positions = {pair: 0 for pair in trading_pairs}  # Track positions for each pair
-        self.last_trade_time = datetime.now() # Keep track of last trade time to respect interval
+        self.positions = dict.fromkeys(trading_pairs, 0.0)  # Track positions for each pair
+        self._rng = random.Random() # Private generator for the placeholder strategy
 
     async def run(self):
         """
@@ -88,44 +98,51 @@ class TradingAgent:
         5. Manage positions and risk.
         6. Log trading activity.
         """
-        print("Trading Agent started...")
-        print(f"Monitoring pairs: {self.trading_pairs}")
-        print(f"Initial Capital: {self.capital} USDC")
-        print(f"Risk Factor: {self.risk_factor}")
-        print(f"Dry Run Mode: {'Enabled' if self.dry_run else 'Disabled'}")
-        print(f"Trading Interval: {self.interval} seconds")
-        print(f"Show Reasoning: {'Enabled' if self.show_reasoning else 'Disabled'}")
-
+        logger.info("Trading Agent started...")
+        logger.info("Monitoring pairs: %s", self.trading_pairs)
+        logger.info("Initial Capital: %s USDC", self.capital)
+        logger.info("Risk Factor: %s", self.risk_factor)
+        logger.info("Dry Run Mode: %s", 'Enabled' if self.dry_run else 'Disabled')
+        logger.info("Trading Interval: %s seconds", self.interval)
+        logger.info("Show Reasoning: %s", 'Enabled' if self.show_reasoning else 'Disabled')
+
+        loop = asyncio.get_running_loop()
+        next_deadline = loop.time() # Monotonic clock, unaffected by NTP adjustments
         while True: # Main trading loop
-            current_time = datetime.now()
-            if current_time - self.last_trade_time >= timedelta(seconds=self.interval):
-                print(f"\n--- Trading Interval: {current_time.strftime('%Y-%m-%d %H:%M:%S')} ---")
-
-                for pair in self.trading_pairs:
-                    print(f"\n--- Analyzing {pair}/USDC ---")
-                    # --- Placeholder for trading logic ---
-                    # In a real implementation, this is where you would:
-                    # 1. Fetch real-time price data for 'pair'
-                    # 2. Calculate technical indicators (using src.tools)
-                    # 3. Implement your trading strategy (potentially using AI reasoning)
-                    # 4. Make buy/sell decisions
-                    # 5. Execute trades (or simulate in dry_run mode)
-
-                    # Example placeholder decision (replace with actual strategy):
-                    action = self.determine_trade_action(pair) # Call a method to decide action
-
-                    if action == "BUY":
-                        await self.execute_trade(pair, "BUY")
-                    elif action == "SELL":
-                        await self.execute_trade(pair, "SELL")
-                    else:
-                        print(f"No trade signal for {pair}")
-
-                self.last_trade_time = current_time # Update last trade time
+            await self._tick()
+            next_deadline += self.interval
+            sleep_for = next_deadline - loop.time()
+            if sleep_for > 0:
+                await asyncio.sleep(sleep_for) # Sleep exactly until the next interval
             else:
-                # Wait for the remaining interval time
-                wait_seconds = (timedelta(seconds=self.interval) - (current_time - self.last_trade_time)).total_seconds()
-                await asyncio.sleep(wait_seconds) # Wait until next interval
+                next_deadline = loop.time() # Fell behind; resync instead of firing back-to-back
+
+    async def _tick(self):
+        """
+        Runs one trading interval: analyzes every pair and acts on the resulting signals.
+        """
+        logger.info("--- Trading Interval ---") # Timestamp comes from the log format
+
+        # Example placeholder decisions for all pairs at once (replace with actual strategy):
+        actions = self.determine_trade_actions(self.trading_pairs)
+
+        for pair, action in zip(self.trading_pairs, actions):
+            if self.show_reasoning:
+                logger.debug("--- Analyzing %s/USDC ---", pair)
+            # --- Placeholder for trading logic ---
+            # In a real implementation, this is where you would:
+            # 1. Fetch real-time price data for 'pair'
+            # 2. Calculate technical indicators (using src.tools)
+            # 3. Implement your trading strategy (potentially using AI reasoning)
+            # 4. Make buy/sell decisions
+            # 5. Execute trades (or simulate in dry_run mode)
+
+            if action == "BUY":
+                await self.execute_trade(pair, "BUY")
+            elif action == "SELL":
+                await self.execute_trade(pair, "SELL")
+            elif self.show_reasoning:
+                logger.debug("No trade signal for %s", pair)
 
     def determine_trade_action(self, pair: str) -> str:
         """
@@ -138,9 +155,14 @@ class TradingAgent:
         For now, it returns a random action for demonstration purposes.
         """
         # --- Replace with actual trading strategy logic ---
-        import random
-        actions = ["BUY", "SELL", None] # None represents HOLD
-        return random.choice(actions)
+        return self._rng.choice(self._ACTIONS)
+
+    def determine_trade_actions(self, pairs: List[str]) -> List[str]:
+        """
+        Vectorized form of determine_trade_action: one decision per pair, drawn in a single call.
+        """
+        # --- Replace with actual trading strategy logic ---
+        return self._rng.choices(self._ACTIONS, k=len(pairs))
 
 
     async def execute_trade(self, pair: str, trade_type: str):
@@ -157,28 +179,55 @@ class TradingAgent:
         """
         if trade_type == "BUY":
             trade_amount_usdc = self.capital * self.risk_factor # Example trade size calculation
-            print(f"Simulating BUY {pair} with {trade_amount_usdc:.2f} USDC (Dry Run: {self.dry_run})")
+            logger.info("Simulating BUY %s with %.2f USDC (Dry Run: %s)", pair, trade_amount_usdc, self.dry_run)
             if not self.dry_run:
                 # --- Real trade execution logic here (interact with Solana DEX) ---
-                print(f"** REAL BUY ORDER EXECUTION WOULD HAPPEN HERE FOR {pair} **")
+                logger.info("** REAL BUY ORDER EXECUTION WOULD HAPPEN HERE FOR %s **", pair)
                 pass # Replace with actual DEX interaction
             else:
-                print(f"** DRY RUN: BUY order simulated for {pair} **")
+                logger.info("** DRY RUN: BUY order simulated for %s **", pair)
             self.positions[pair] += 1 # Example position update (need actual calculation)
 
 
         elif trade_type == "SELL":
-            print(f"Simulating SELL {pair} (Dry Run: {self.dry_run})")
+            logger.info("Simulating SELL %s (Dry Run: %s)", pair, self.dry_run)
             if not self.dry_run:
                 # --- Real trade execution logic here (interact with Solana DEX) ---
-                print(f"** REAL SELL ORDER EXECUTION WOULD HAPPEN HERE FOR {pair} **")
+                logger.info("** REAL SELL ORDER EXECUTION WOULD HAPPEN HERE FOR %s **", pair)
                 pass # Replace with actual DEX interaction
             else:
-                print(f"** DRY RUN: SELL order simulated for {pair} **")
+                logger.info("** DRY RUN: SELL order simulated for %s **", pair)
             self.positions[pair] -= 1 # Example position update (need actual calculation)
 
         else:
-            print(f"Invalid trade type: {trade_type}")
+            logger.warning("Invalid trade type: %s", trade_type)
+
+
+def setup_logging(verbose: bool = False) -> logging.handlers.QueueListener:
+    """
+    Routes root logging through a queue so the event loop never blocks on stderr.
+
+    Records are enqueued by a QueueHandler and written by a QueueListener thread;
+    the listener is stopped (and the queue flushed) at interpreter exit.
+
+    Args:
+        verbose (bool): If True, also emit DEBUG records (per-pair reasoning).
+
+    Returns:
+        logging.handlers.QueueListener: The started listener.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(logging.DEBUG if verbose else logging.INFO)
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
 
 
 def parse_args() -> argparse.Namespace:
@@ -251,10 +300,9 @@ def validate_args(args: argparse.Namespace):
     if args.interval < 10:
         raise ValueError("Trading interval must be at least 10 seconds.")
 
-    supported_pairs = ['SOL', 'BONK', 'JUP'] # Define supported trading pairs
-    for pair in args.pairs:
-        if pair not in supported_pairs:
-            raise ValueError(f"Unsupported trading pair: {pair}. Supported pairs are: {supported_pairs}")
+    unsupported = set(args.pairs) - SUPPORTED_PAIRS # One set difference instead of a check per pair
+    if unsupported:
+        raise ValueError(f"Unsupported trading pair(s): {', '.join(sorted(unsupported))}. Supported pairs are: {sorted(SUPPORTED_PAIRS)}")
 
 
 if __name__ == "__main__":
@@ -262,6 +310,7 @@ if __name__ == "__main__":
     Main entry point of the script. Parses arguments, initializes the TradingAgent, and starts the trading loop.
     """
     args = parse_args() # Parse command-line arguments
+    setup_logging(verbose=args.show_reasoning) # Queue-backed logging, configured once
 
     # Initialize the TradingAgent with parsed arguments
     trading_agent = TradingAgent(
@@ -273,4 +322,11 @@ if __name__ == "__main__":
         show_reasoning=args.show_reasoning
     )
 
-    asyncio.run(trading_agent.run()) # Run the trading agent's main loop asynchronously
\ No newline at end of file
+    async def _main():
+        # Eager tasks run synchronously until their first real await (Python 3.12+), so a task
+        # that completes without suspending skips the scheduler; the loop itself spawns none yet
+        if hasattr(asyncio, "eager_task_factory"):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        await trading_agent.run()
+
+    asyncio.run(_main()) # Run the trading agent's main loop asynchronously
\ No newline at end of file
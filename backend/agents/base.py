@@ -1,7 +1,11 @@
 # src/agents/base.py
+import asyncio
 from typing import Dict, List, Optional
+from collections import deque
+from itertools import islice
 from datetime import datetime
 import logging
+import orjson
 from llm_client import GaiaLLM  # Ensure GaiaLLM is imported
 
 logger = logging.getLogger(__name__)
@@ -9,6 +13,46 @@ logger = logging.getLogger(__name__)
 class BaseAgent:
     """Base agent with core capabilities."""
     
+    SYSTEM_PROMPT = """You are an expert crypto trading AI assistant. 
+    Analyze market data and provide clear, actionable insights focused on:
+    - Technical analysis
+    - Risk assessment
+    - Market sentiment
+    - Trading opportunities"""
+    
+    # Shared by every request; providers copy messages, so one dict is enough
+    SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+    
+    # Completion budget per context type; decisions only need a short JSON object
+    MAX_TOKENS = {'trade_decision': 120, 'market_analysis': 500}
+    DEFAULT_MAX_TOKENS = 500
+    DECISION_FORMAT = (
+        '{"token", "action", "confidence", "reasoning"} where action is '
+        "buy, sell or hold, confidence is between 0 and 1 and reasoning is one short sentence"
+    )
+    
+    @staticmethod
+    def _dumps(context) -> str:
+        """Compact JSON for prompt payloads (NumPy values and datetimes included)."""
+        return orjson.dumps(context, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    
+    @staticmethod
+    def _parse_decision(text: str) -> Optional[Dict]:
+        """Parse a JSON decision object out of LLM text, or None if there isn't one."""
+        start, end = text.find('{'), text.rfind('}')
+        if start < 0 or end < start:
+            return None
+        try:
+            row = orjson.loads(text[start:end + 1])
+            return {
+                'token': row.get('token'),
+                'action': str(row.get('action', 'hold')).lower(),
+                'confidence': float(row.get('confidence', 0.5)),
+                'reasoning': row.get('reasoning', '')
+            }
+        except (ValueError, TypeError, AttributeError):
+            return None
+    
     def __init__(
         self,
         llm_config: Optional[Dict] = None,
@@ -27,38 +71,45 @@ class BaseAgent:
         self.last_thought = None
         
     async def think(self, context: Dict) -> Dict:
-        """Core thinking process."""
+        """Core thinking process.
+        
+        Trade decisions ask for a compact JSON reply under a small token
+        budget; its action/confidence/reasoning are merged into the result.
+        """
+        kind = context.get('type') if isinstance(context, dict) else None
         try:
             # Format messages for LLM
+            if kind == 'trade_decision':
+                content = f"Output one JSON object {self.DECISION_FORMAT} for:\n{self._dumps(context)}"
+            else:
+                content = f"Analyze the following market context and provide insights:\n{self._dumps(context)}"
             messages = [
-                {
-                    "role": "system",
-                    "content": """You are an expert crypto trading AI assistant. 
-                    Analyze market data and provide clear, actionable insights focused on:
-                    - Technical analysis
-                    - Risk assessment
-                    - Market sentiment
-                    - Trading opportunities"""
-                },
+                self.SYSTEM_MSG,
                 {
                     "role": "user",
-                    "content": f"Analyze the following market context and provide insights:\n{context}"
+                    "content": content
                 }
             ]
             
             # Get LLM response
             response = await self.llm.chat_completion(
                 messages=messages,
-                max_tokens=500,
+                max_tokens=self.MAX_TOKENS.get(kind, self.DEFAULT_MAX_TOKENS),
                 temperature=0.7
             )
             
             try:
                 thought = response["choices"][0]["message"]["content"]
-                return {
+                result = {
                     "thought": thought,
                     "timestamp": datetime.now().isoformat()
                 }
+                if kind == 'trade_decision':
+                    decision = self._parse_decision(thought)
+                    if decision:
+                        decision.pop('token')
+                        result.update(decision)
+                return result
             except (KeyError, IndexError) as e:
                 logger.error(f"Error parsing LLM response: {e}")
                 return {
@@ -74,6 +125,54 @@ class BaseAgent:
                 "timestamp": datetime.now().isoformat()
             }
             
+    async def think_batch(self, contexts: List[Dict]) -> List[Dict]:
+        """Think about several token contexts with a single LLM call.
+        
+        Returns one decision per context, in order. Contexts whose row
+        cannot be parsed from the batched reply fall back to `think`.
+        """
+        if not contexts:
+            return []
+            
+        rows = "\n".join(f"{i}. {self._dumps(context)}" for i, context in enumerate(contexts, 1))
+        messages = [
+            self.SYSTEM_MSG,
+            {
+                "role": "user",
+                "content": (
+                    f"For each token below, output one JSON line {self.DECISION_FORMAT}:\n" + rows
+                )
+            }
+        ]
+        
+        decisions: Dict[str, Dict] = {}
+        try:
+            response = await self.llm.chat_completion(
+                messages=messages,
+                max_tokens=self.MAX_TOKENS['trade_decision'] * len(contexts),
+                temperature=0.7
+            )
+            content = response["choices"][0]["message"]["content"]
+            timestamp = datetime.now().isoformat()
+            
+            for line in content.splitlines():
+                decision = self._parse_decision(line)
+                if decision is None or decision['token'] is None:
+                    continue
+                token = str(decision.pop('token'))
+                decision['timestamp'] = timestamp
+                decisions[token] = decision
+        except Exception as e:
+            logger.error(f"Error in batched thinking process: {e}")
+            
+        results = [decisions.get(str(context.get('token'))) for context in contexts]
+        missing = [i for i, decision in enumerate(results) if decision is None]
+        # Unparsed rows each need their own call; make them concurrently
+        fallbacks = await asyncio.gather(*(self.think(contexts[i]) for i in missing))
+        for i, decision in zip(missing, fallbacks):
+            results[i] = decision
+        return results
+            
     async def close(self):
         """Cleanup resources."""
         if hasattr(self, 'llm'):
@@ -81,8 +180,9 @@ class BaseAgent:
 
     async def learn(self, experience: Dict):
         """Learn from experience and update memory."""
+        timestamp = datetime.now().isoformat()
         await self.memory.add({
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
             'type': 'experience',
             'data': experience
         })
@@ -90,7 +190,8 @@ class BaseAgent:
         # Analyze experience for learning
         analysis = await self.think({
             'type': 'learning',
-            'experience': experience
+            'experience': experience,
+            'timestamp': timestamp
         })
         
         # Update objectives if needed
@@ -121,14 +222,15 @@ class MemoryState:
     """Memory state management for the agent."""
     def __init__(self, size: int = 1000):
         self.size = size
-        self.memory = []
+        self.memory = deque(maxlen=size)  # Oldest entry is evicted in O(1) when full
 
     async def add(self, entry: Dict):
         """Add a new entry to memory."""
-        if len(self.memory) >= self.size:
-            self.memory.pop(0)  # Remove the oldest entry if memory is full
         self.memory.append(entry)
 
     def get_recent(self, n: int = 5) -> List[Dict]:
         """Get the most recent n entries from memory."""
-        return self.memory[-n:]
\ No newline at end of file
+        if n <= 0:
+            return []
+        # Walk back from the newest entry rather than copying the whole deque
+        return list(islice(reversed(self.memory), n))[::-1]
\ No newline at end of file
@@ -1,22 +1,73 @@
 # src/agents/hedge_fund.py
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
 from .base import BaseAgent
-from tools import CryptoDataTools
+from _njit import compute_trade_sizes, signal_mask
+from tools import CryptoDataTools, TokenMetrics
 from executors.jupiter_client import JupiterClient
+from http_utils import TTLCache
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_MARKET_DATA = {
-    'price': 0.0,
-    'volume': 0.0,
-    'liquidity': 0.0,
-    'holders': 0,
-    'transactions': 0,
-    'error': 'Using default data due to API error'
-}
+DEFAULT_METRICS_ERROR = 'Using default data due to API error'
+
+# Maximum number of memoized LLM trade decisions kept per agent
+THOUGHT_CACHE_SIZE = 256
+
+@dataclass
+class Portfolio:
+    """Portfolio state in struct-of-arrays layout.
+    
+    Row i of `amounts`, `prices` and `changes_24h` belongs to `tokens[i]`.
+    `tokens` is kept sorted so rows can be found with np.searchsorted.
+    """
+    cash: float
+    total_value: float
+    tokens: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=object))
+    amounts: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    prices: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    changes_24h: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    
+    @classmethod
+    def from_tokens(cls, cash: float, tokens: List[str]) -> "Portfolio":
+        """Create an all-cash portfolio with one empty row per token."""
+        names = np.array(sorted(set(tokens)), dtype=object)
+        return cls(
+            cash=cash,
+            total_value=cash,
+            tokens=names,
+            amounts=np.zeros(len(names)),
+            prices=np.zeros(len(names)),
+            changes_24h=np.zeros(len(names))
+        )
+        
+    def index(self, token: str) -> int:
+        """Row of `token`, inserting an empty row in sorted position if it is new."""
+        idx = int(np.searchsorted(self.tokens, token))
+        if idx < len(self.tokens) and self.tokens[idx] == token:
+            return idx
+            
+        self.tokens = np.insert(self.tokens, idx, token)
+        self.amounts = np.insert(self.amounts, idx, 0.0)
+        self.prices = np.insert(self.prices, idx, 0.0)
+        self.changes_24h = np.insert(self.changes_24h, idx, 0.0)
+        return idx
+        
+    def to_dict(self) -> Dict:
+        """Plain-dict view (cash, non-zero positions, total value) for LLM prompts."""
+        held = self.amounts != 0
+        return {
+            'cash': self.cash,
+            'positions': dict(zip(self.tokens[held].tolist(), self.amounts[held].tolist())),
+            'total_value': self.total_value
+        }
 
 class HedgeFundAgent(BaseAgent):
     """Autonomous hedge fund agent."""
@@ -26,57 +77,80 @@ class HedgeFundAgent(BaseAgent):
         initial_capital: float,
         trading_pairs: List[str],
         risk_tolerance: float = 0.7,
-        llm_config: Optional[Dict] = None
+        llm_config: Optional[Dict] = None,
+        price_ttl: float = 10.0,
+        metrics_ttl: float = 10.0,
+        thought_ttl: float = 30.0,
+        max_connections: int = 100
     ):
         super().__init__(llm_config)
         self.initial_capital = initial_capital
         self.trading_pairs = trading_pairs
         self.risk_tolerance = risk_tolerance
         
+        # Short-lived caches keyed by token: token -> (value, monotonic_ts)
+        self.price_ttl = price_ttl
+        self.metrics_ttl = metrics_ttl
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
+        self._metrics_cache: Dict[str, Tuple[TokenMetrics, float]] = {}
+        # Trade decisions expire too, so a steady price cannot replay one forever
+        self._thought_cache = TTLCache(thought_ttl, max_entries=THOUGHT_CACHE_SIZE)
+        
         # Initialize components
         self.data_tools = CryptoDataTools()
-        self.jupiter = JupiterClient()
+        self.jupiter = JupiterClient(max_connections=max_connections)
         
         # Portfolio state
-        self.portfolio = {
-            'cash': initial_capital,
-            'positions': {},
-            'total_value': initial_capital
-        }
+        self.portfolio = Portfolio.from_tokens(initial_capital, trading_pairs)
+        
+    async def close(self):
+        """Cleanup resources, including the Jupiter connection pool."""
+        await self.jupiter.close()
+        await super().close()
         
     async def analyze_market(self, tokens: List[str]) -> Dict:
         """Analyze market conditions for given tokens."""
-        market_data = {}
+        market_data: Dict[str, TokenMetrics] = {}
+        timestamp = datetime.now().isoformat()  # One instant for the whole tick
+        
+        # Fetch all tokens concurrently; failures come back as exceptions
+        results = await asyncio.gather(
+            *(self.get_token_metrics(token) for token in tokens),
+            return_exceptions=True
+        )
         
-        # Process each token individually
-        for token in tokens:
-            try:
-                # Get market data
-                metrics = await self.data_tools.get_token_metrics(token)
+        for token, metrics in zip(tokens, results):
+            if isinstance(metrics, Exception):
+                logger.error(f"Error getting metrics for {token}: {metrics}")
+                market_data[token] = TokenMetrics(error=DEFAULT_METRICS_ERROR)
+                continue
                 
-                market_data[token] = {
-                    'price': metrics.price if hasattr(metrics, 'price') else 0.0,
-                    'volume': metrics.volume if hasattr(metrics, 'volume') else 0.0,
-                    'liquidity': metrics.liquidity if hasattr(metrics, 'liquidity') else 0.0,
-                    'holders': metrics.holders if hasattr(metrics, 'holders') else 0,
-                    'transactions': metrics.transactions if hasattr(metrics, 'transactions') else 0
-                }
-            except Exception as e:
-                logger.error(f"Error getting metrics for {token}: {e}")
-                market_data[token] = DEFAULT_MARKET_DATA.copy()
+            market_data[token] = metrics
+            
+        # Column view of the snapshot; errored rows get no price
+        prices, changes = self._market_arrays(market_data)
+        
+        # Mirror the snapshot into the portfolio arrays
+        for token, price, change in zip(market_data, prices, changes):
+            idx = self.portfolio.index(token)
+            self.portfolio.prices[idx] = price
+            self.portfolio.changes_24h[idx] = change
         
         # Generate thought about market conditions
         analysis = await self.think({
             'type': 'market_analysis',
-            'data': market_data,
-            'portfolio': self.portfolio,
-            'timestamp': datetime.now().isoformat()
+            'data': {token: metrics.to_llm_dict() for token, metrics in market_data.items()},
+            'portfolio': self.portfolio.to_dict(),
+            'timestamp': timestamp
         })
 
         result = {
             'market_data': market_data,
             'analysis': analysis.get('thought', ''),
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
+            'tokens': list(market_data),
+            'prices': prices,
+            'changes': changes,
             'trades': []  # Initialize empty trades list
         }
 
@@ -94,64 +168,98 @@ class HedgeFundAgent(BaseAgent):
         """Generate trades based on market analysis."""
         trades = []
         
-        for token, data in analysis['market_data'].items():
-            if data.get('error'):
-                continue  # Skip tokens with errors
-
-            # Default conservative position size (1% of portfolio)
-            position_size = self.portfolio['total_value'] * 0.01
-                
-            # Simple trading logic if LLM is not available
-            if data['price'] > 0:
-                price_24h_change = data.get('price_change_24h', 0)
-                
-                if price_24h_change > 5:  # 5% up
-                    trades.append({
-                        'token': token,
-                        'action': 'sell',
-                        'amount': position_size,
-                        'confidence': 0.6,
-                        'reasoning': f"Price up {price_24h_change}% in 24h"
-                    })
-                elif price_24h_change < -5:  # 5% down
-                    trades.append({
-                        'token': token,
-                        'action': 'buy',
-                        'amount': position_size,
-                        'confidence': 0.6,
-                        'reasoning': f"Price down {price_24h_change}% in 24h"
-                    })
+        # Reuse the columns built by analyze_market when present
+        tokens = analysis.get('tokens')
+        prices, changes = analysis.get('prices'), analysis.get('changes')
+        if tokens is None or prices is None or changes is None:
+            tokens = list(analysis['market_data'])
+            prices, changes = self._market_arrays(analysis['market_data'])
+        
+        # Simple trading logic if LLM is not available: fade 5% daily moves.
+        # Errored tokens carry no price, so they are never tradable.
+        sells, buys = signal_mask(changes, prices)
+        
+        # Default conservative position size (1% of portfolio)
+        position_size = float(self.portfolio.total_value * 0.01)
+        
+        for i in np.flatnonzero(sells | buys):
+            change = float(changes[i])
+            trades.append({
+                'token': tokens[i],
+                'action': 'sell' if sells[i] else 'buy',
+                'amount': position_size,
+                'confidence': 0.6,
+                'reasoning': f"Price {'up' if sells[i] else 'down'} {change}% in 24h"
+            })
                     
         return trades
 
+    @staticmethod
+    def _market_arrays(market_data: Dict[str, TokenMetrics]):
+        """Return (prices, changes) float64 columns in market_data order."""
+        rows = market_data.values()
+        prices = np.fromiter(
+            (0.0 if metrics.error else metrics.price for metrics in rows),
+            dtype=np.float64, count=len(rows)
+        )
+        changes = np.fromiter(
+            (metrics.price_change_24h for metrics in rows),
+            dtype=np.float64, count=len(rows)
+        )
+        return prices, changes
+
     async def generate_trades(self, analysis: Dict) -> List[Dict]:
         """Generate trading decisions based on analysis."""
         trades = []
         
+        contexts = []
         for token in self.trading_pairs:
-            token_data = analysis['market_data'].get(token, {})
-            if 'error' not in token_data:
-                # Get trade decision
-                decision = await self.think({
+            metrics = analysis['market_data'].get(token)
+            if metrics is not None and not metrics.error:
+                contexts.append({
                     'type': 'trade_decision',
                     'token': token,
-                    'data': token_data,
+                    'data': metrics.to_llm_dict(),
                     'analysis': analysis['analysis'],
-                    'portfolio': self.portfolio
+                    'portfolio': self.portfolio.to_dict()
                 })
                 
-                if decision.get('action') in ['buy', 'sell']:
-                    trades.append({
-                        'token': token,
-                        'action': decision['action'],
-                        'amount': self.calculate_trade_size(
-                            token,
-                            decision.get('confidence', 0.5),
-                            token_data
-                        ),
-                        'confidence': decision.get('confidence', 0.5),
-                        'reasoning': decision.get('reasoning', '')
-                    })
+        # Reuse memoized decisions and ask the LLM about the rest in one call
+        keys = [self._thought_key(context) for context in contexts]
+        decisions = [self._thought_cache.get(key) for key in keys]
+        pending = [i for i, decision in enumerate(decisions) if decision is None]
+        if pending:
+            fresh = await self.think_batch([contexts[i] for i in pending])
+            for i, decision in zip(pending, fresh):
+                decisions[i] = decision
+                self._remember_thought(keys[i], decision)
+        
+        selected = [
+            (context, decision) for context, decision in zip(contexts, decisions)
+            if decision.get('action') in ['buy', 'sell']
+        ]
+        if not selected:
+            return trades
+            
+        # Size every selected trade in one kernel call
+        confidence = np.array([d.get('confidence', 0.5) for _, d in selected], dtype=np.float64)
+        liquidity = np.array([c['data'].get('liquidity', 0) for c, _ in selected], dtype=np.float64)
+        sizes = compute_trade_sizes(
+            self.portfolio.total_value,
+            self.portfolio.cash,
+            confidence,
+            liquidity
+        )
+        
+        # Trades leave here with float amount/confidence so update_portfolio needn't convert
+        for (context, decision), size, conf in zip(selected, sizes.tolist(), confidence.tolist()):
+            trades.append({
+                'token': context['token'],
+                'action': decision['action'],
+                'amount': size,
+                'confidence': conf,
+                'reasoning': decision.get('reasoning', '')
+            })
         
         return trades
         
@@ -161,91 +269,147 @@ class HedgeFundAgent(BaseAgent):
         confidence: float,
         market_data: Dict
     ) -> float:
-        """Calculate trade size based on multiple factors."""
-        # Base position size (% of portfolio)
-        max_position = self.portfolio['total_value'] * 0.2  # 20% max position
+        """Calculate trade size based on multiple factors.
         
-        # Scale by confidence
-        position_size = max_position * confidence
-        
-        # Scale by liquidity
-        liquidity = market_data.get('liquidity', 0)
-        if liquidity > 0:
-            # Limit to 10% of available liquidity
-            position_size = min(position_size, liquidity * 0.1)
-        
-        # Ensure we have enough cash for buys
-        if position_size > self.portfolio['cash']:
-            position_size = self.portfolio['cash']
-        
-        return position_size
+        20% of the portfolio scaled by confidence, limited to 10% of
+        available liquidity and to the cash on hand.
+        """
+        sizes = compute_trade_sizes(
+            self.portfolio.total_value,
+            self.portfolio.cash,
+            np.array([confidence], dtype=np.float64),
+            np.array([market_data.get('liquidity', 0)], dtype=np.float64)
+        )
+        return float(sizes[0])
         
     async def execute_trades(self, trades: List[Dict]) -> Dict:
-        """Execute validated trades."""
-        results = {}
+        """Execute validated trades concurrently."""
+        outcomes = await asyncio.gather(
+            *(self._execute_one(trade) for trade in trades),
+            return_exceptions=True
+        )
         
-        for trade in trades:
-            try:
-                # Execute trade through Jupiter
-                result = await self.jupiter.execute_trade(
-                    input_token=trade['token'],
-                    output_token='USDC',
-                    amount=trade['amount'],
-                    exact_out=trade['action'] == 'sell'
-                )
-                
-                if result['success']:
-                    # Update portfolio
-                    self.update_portfolio(trade, result)
-                    
-                results[trade['token']] = result
-                
-            except Exception as e:
-                logger.error(f"Trade execution error: {e}")
-                results[trade['token']] = {
+        results = {}
+        filled = False
+        for trade, outcome in zip(trades, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Trade execution error: {outcome}")
+                outcome = {
                     'success': False,
-                    'error': str(e)
+                    'error': str(outcome)
                 }
+            elif outcome['success']:
+                # Apply fills only once every trade has settled
+                self._apply_fill(trade, outcome)
+                filled = True
+                
+            results[trade['token']] = outcome
+            
+        if filled:
+            await self.calculate_total_value()
                 
         return results
         
-    def update_portfolio(self, trade: Dict, result: Dict):
+    async def _execute_one(self, trade: Dict) -> Dict:
+        """Execute a single trade through Jupiter; errors are collected by execute_trades."""
+        return await self.jupiter.execute_trade(
+            input_token=trade['token'],
+            output_token='USDC',
+            amount=trade['amount'],
+            exact_out=trade['action'] == 'sell'
+        )
+        
+    async def update_portfolio(self, trade: Dict, result: Dict):
         """Update portfolio after successful trade."""
-        token = trade['token']
-        amount = float(trade['amount'])
-        price = float(result['executed_price'])
+        self._apply_fill(trade, result)
+            
+        # Update total value
+        await self.calculate_total_value()
+        
+    def _apply_fill(self, trade: Dict, result: Dict):
+        """Move cash and position for a filled trade (no revaluation)."""
+        amount = trade['amount']  # Already a float, see generate_trades*
+        # Executors may report the fill price as a Decimal
+        amount_usd = amount * float(result['executed_price'])
+        idx = self.portfolio.index(trade['token'])
         
         if trade['action'] == 'buy':
-            self.portfolio['cash'] -= amount * price
-            self.portfolio['positions'][token] = \
-                self.portfolio['positions'].get(token, 0) + amount
+            self.portfolio.cash -= amount_usd
+            self.portfolio.amounts[idx] += amount
         else:
-            self.portfolio['cash'] += amount * price
-            self.portfolio['positions'][token] = \
-                self.portfolio['positions'].get(token, 0) - amount
-            
-        # Update total value
-        self.calculate_total_value()
+            self.portfolio.cash += amount_usd
+            self.portfolio.amounts[idx] -= amount
         
-    def calculate_total_value(self):
+    async def calculate_total_value(self):
         """Calculate total portfolio value."""
-        total = self.portfolio['cash']
-        
-        for token, amount in self.portfolio['positions'].items():
-            # Get current price
-            try:
-                price = float(self.get_current_price(token))
-                total += amount * price
-            except Exception as e:
-                logger.error(f"Error getting price for {token}: {e}")
+        portfolio = self.portfolio
+        held = np.flatnonzero(portfolio.amounts)
+        
+        # Refresh prices of all held positions concurrently
+        prices = await asyncio.gather(
+            *(self.get_current_price(portfolio.tokens[i]) for i in held),
+            return_exceptions=True
+        )
+        
+        for i, price in zip(held, prices):
+            if isinstance(price, Exception):
+                logger.error(f"Error getting price for {portfolio.tokens[i]}: {price}")
+                continue
+            portfolio.prices[i] = price
                 
-        self.portfolio['total_value'] = total
+        portfolio.total_value = portfolio.cash + float(portfolio.amounts @ portfolio.prices)
+        
+    @staticmethod
+    def _thought_key(context: Dict) -> Tuple:
+        """Key near-identical token contexts, under the same market view and
+        holdings, to the same memoized thought."""
+        data = context.get('data', {})
+        portfolio = context.get('portfolio', {})
+        token = context.get('token')
+        return (
+            context.get('type'),
+            token,
+            round(data.get('price', 0.0), 4),
+            round(data.get('volume', 0.0), 2),
+            context.get('analysis'),
+            round(portfolio.get('cash', 0.0), 2),
+            portfolio.get('positions', {}).get(token, 0.0)
+        )
+        
+    def _remember_thought(self, key: Tuple, thought: Dict):
+        """Memoize a successful thought for `thought_ttl` seconds."""
+        if 'error' in thought:
+            return
+        self._thought_cache.put(key, thought)
+        
+    async def get_token_metrics(self, token: str) -> TokenMetrics:
+        """Get token metrics, served from cache while fresh."""
+        now = time.monotonic()
+        cached = self._metrics_cache.get(token)
+        if cached is not None and now - cached[1] < self.metrics_ttl:
+            return cached[0]
+            
+        metrics = await self.data_tools.get_token_metrics(token)
+        if metrics.error is None:
+            self._metrics_cache[token] = (metrics, now)
+        return metrics
         
     async def get_current_price(self, token: str) -> float:
         """Get current token price."""
+        now = time.monotonic()
+        cached = self._price_cache.get(token)
+        if cached is not None and now - cached[1] < self.price_ttl:
+            return cached[0]
+            
         try:
             price = await self.jupiter.get_price(token)
-            return float(price) if price else 0.0
         except Exception as e:
             logger.error(f"Error getting price for {token}: {e}")
-            return 0.0
\ No newline at end of file
+            return 0.0
+            
+        if not price:
+            return 0.0
+            
+        price = float(price)
+        self._price_cache[token] = (price, now)
+        return price
\ No newline at end of file
@@ -1,5 +1,7 @@
 # src/market_analyzer.py
+import asyncio
 import logging
+import math
 from typing import Dict, List, Optional, Union
 from dataclasses import dataclass
 import pandas as pd
@@ -7,12 +9,14 @@ import numpy as np
 from datetime import datetime, timedelta
 from decimal import Decimal
 
-from tools import CryptoDataTools
+from _njit import all_indicators, bollinger_position_last, macd_last, max_drawdown, pct_returns, rsi_last
+from indicators import indicator_series
+from tools import CryptoDataTools, TokenMetrics
 from executors.jupiter_client import JupiterClient
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketAnalysis:
     """Market analysis result structure."""
     token: str
@@ -28,6 +32,10 @@ class MarketAnalysis:
 class MarketAnalyzer:
     """Advanced market analysis for crypto trading."""
     
+    # Annualization constants (252 trading days)
+    _SQRT_252 = math.sqrt(252.0)
+    _INV_252 = 1.0 / 252.0
+    
     def __init__(
         self,
         config: Optional[Dict] = None,
@@ -43,10 +51,12 @@ class MarketAnalyzer:
     async def analyze_token(self, token: str) -> MarketAnalysis:
         """Perform comprehensive token analysis."""
         try:
-            # Get market data
-            metrics = await self.data_tools.get_token_metrics(token)
-            history = await self.data_tools.get_historical_prices(token, self.lookback_period)
-            liquidity = await self.get_liquidity_metrics(token)
+            # Get market data; the three fetches are independent, so run them together
+            metrics, history, liquidity = await asyncio.gather(
+                self.data_tools.get_token_metrics(token),
+                self.data_tools.get_historical_prices(token, self.lookback_period),
+                self.get_liquidity_metrics(token)
+            )
             
             # Technical analysis
             technical = self.calculate_technical_indicators(history)
@@ -78,29 +88,35 @@ class MarketAnalyzer:
             raise
             
     def calculate_technical_indicators(self, history: pd.DataFrame) -> Dict[str, float]:
-        """Calculate technical analysis indicators."""
+        """Calculate technical analysis indicators in one pass over the prices."""
         try:
-            price_series = history['price']
+            rsi, macd_hist, bollinger, momentum, volatility = all_indicators(
+                history['price'].to_numpy(dtype=np.float64)
+            )
             
             return {
-                'rsi': self.calculate_rsi(price_series),
-                'macd': self.calculate_macd(price_series)['histogram'],
-                'bollinger_position': self.calculate_bollinger_position(price_series),
-                'momentum': self.calculate_momentum(price_series),
-                'volatility': self.calculate_volatility(price_series)
+                'rsi': float(rsi),
+                'macd': float(macd_hist),
+                'bollinger_position': float(bollinger),
+                'momentum': float(momentum),
+                'volatility': float(volatility)
             }
         except Exception as e:
             logger.error(f"Error calculating technical indicators: {e}")
             return {}
 
+    # Full-history indicators live outside the agents package so the backtester can use them
+    calculate_indicator_series = staticmethod(indicator_series)
+
     def calculate_risk_metrics(
         self,
         history: pd.DataFrame,
-        metrics: Dict[str, float]
+        metrics: Union[TokenMetrics, Dict[str, float]]
     ) -> Dict[str, float]:
         """Calculate risk metrics."""
         try:
-            returns = history['price'].pct_change().dropna()
+            prices = history['price'].to_numpy(dtype=np.float64)
+            returns = pct_returns(prices)
             
             var = self.calculate_value_at_risk(returns)
             sharp = self.calculate_sharpe_ratio(returns)
@@ -108,8 +124,8 @@ class MarketAnalyzer:
             return {
                 'value_at_risk': var,
                 'sharpe_ratio': sharp,
-                'volatility': returns.std() * np.sqrt(252),  # Annualized
-                'max_drawdown': self.calculate_max_drawdown(history['price']),
+                'volatility': float(returns.std(ddof=1) * self._SQRT_252) if returns.size > 1 else 0.0,  # Annualized
+                'max_drawdown': float(max_drawdown(prices)),
                 'liquidity_risk': self.calculate_liquidity_risk(metrics)
             }
         except Exception as e:
@@ -188,18 +204,11 @@ class MarketAnalyzer:
             }
 
     # Technical Analysis Helper Methods
+    # Short or degenerate inputs are handled by explicit checks (here or in the
+    # kernels); callers' outer try blocks only see genuinely bad data.
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> float:
         """Calculate Relative Strength Index."""
-        try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return float(rsi.iloc[-1])
-        except Exception:
-            return 50.0
+        return float(rsi_last(prices.to_numpy(dtype=np.float64), period))
 
     def calculate_macd(
         self,
@@ -209,20 +218,18 @@ class MarketAnalyzer:
         signal_period: int = 9
     ) -> Dict[str, float]:
         """Calculate MACD (Moving Average Convergence Divergence)."""
-        try:
-            fast_ema = prices.ewm(span=fast_period, adjust=False).mean()
-            slow_ema = prices.ewm(span=slow_period, adjust=False).mean()
-            macd = fast_ema - slow_ema
-            signal = macd.ewm(span=signal_period, adjust=False).mean()
-            histogram = macd - signal
-            
-            return {
-                'macd': float(macd.iloc[-1]),
-                'signal': float(signal.iloc[-1]),
-                'histogram': float(histogram.iloc[-1])
-            }
-        except Exception:
-            return {'macd': 0, 'signal': 0, 'histogram': 0}
+        macd, signal, histogram = macd_last(
+            prices.to_numpy(dtype=np.float64),
+            fast_period,
+            slow_period,
+            signal_period
+        )
+        
+        return {
+            'macd': float(macd),
+            'signal': float(signal),
+            'histogram': float(histogram)
+        }
 
     def calculate_bollinger_position(
         self,
@@ -231,18 +238,8 @@ class MarketAnalyzer:
         num_std: float = 2.0
     ) -> float:
         """Calculate relative position within Bollinger Bands."""
-        try:
-            rolling_mean = prices.rolling(window=window).mean()
-            rolling_std = prices.rolling(window=window).std()
-            
-            upper_band = rolling_mean + (rolling_std * num_std)
-            lower_band = rolling_mean - (rolling_std * num_std)
-            
-            # Position as percentage between bands
-            position = (prices.iloc[-1] - lower_band.iloc[-1]) / (upper_band.iloc[-1] - lower_band.iloc[-1])
-            return float(position)
-        except Exception:
-            return 0.5
+        # Position as percentage between bands
+        return float(bollinger_position_last(prices.to_numpy(dtype=np.float64), window, num_std))
 
     def calculate_momentum(
         self,
@@ -250,51 +247,51 @@ class MarketAnalyzer:
         period: int = 14
     ) -> float:
         """Calculate price momentum."""
-        try:
-            return float(prices.pct_change(period).iloc[-1])
-        except Exception:
+        if period <= 0 or len(prices) <= period:
+            return 0.0
+        past = float(prices.iloc[-1 - period])
+        if past == 0:
             return 0.0
+        return float(prices.iloc[-1]) / past - 1
 
     # Risk Analysis Helper Methods
     def calculate_value_at_risk(
         self,
-        returns: pd.Series,
+        returns: Union[pd.Series, np.ndarray],
         confidence_level: float = 0.95
     ) -> float:
         """Calculate Value at Risk."""
-        try:
-            return float(np.percentile(returns, (1 - confidence_level) * 100))
-        except Exception:
+        rets = np.asarray(returns, dtype=np.float64)
+        if rets.size == 0:
             return 0.0
+        return float(np.quantile(rets, 1 - confidence_level))
 
     def calculate_sharpe_ratio(
         self,
-        returns: pd.Series
+        returns: Union[pd.Series, np.ndarray]
     ) -> float:
         """Calculate Sharpe Ratio."""
-        try:
-            excess_returns = returns - self.risk_free_rate/252
-            return float(np.sqrt(252) * excess_returns.mean() / returns.std())
-        except Exception:
+        rets = np.asarray(returns, dtype=np.float64)
+        if rets.size < 2:
+            return 0.0
+        std = rets.std(ddof=1)
+        if std == 0:
             return 0.0
+        return float(self._SQRT_252 * (rets.mean() - self.risk_free_rate * self._INV_252) / std)
 
     def calculate_max_drawdown(self, prices: pd.Series) -> float:
         """Calculate Maximum Drawdown."""
-        try:
-            rolling_max = prices.expanding(min_periods=1).max()
-            drawdown = (prices - rolling_max) / rolling_max
-            return float(drawdown.min())
-        except Exception:
-            return 0.0
+        return float(max_drawdown(prices.to_numpy(dtype=np.float64)))
 
-    def calculate_liquidity_risk(self, metrics: Dict[str, float]) -> float:
+    def calculate_liquidity_risk(self, metrics: Union[TokenMetrics, Dict[str, float]]) -> float:
         """Calculate liquidity risk score."""
-        try:
+        if isinstance(metrics, dict):
             volume = float(metrics.get('volume', 0))
             liquidity = float(metrics.get('liquidity', 0))
+        else:
+            volume = float(metrics.volume)
+            liquidity = float(metrics.liquidity)
             
-            if volume > 0:
-                return min(1.0, liquidity / volume)
-            return 1.0
-        except Exception:
-            return 1.0
\ No newline at end of file
+        if volume > 0:
+            return min(1.0, liquidity / volume)
+        return 1.0
@@ -1,8 +1,14 @@
+import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
-@dataclass
+import numpy as np
+import pandas as pd
+
+from indicators import indicator_series
+
+@dataclass(slots=True, frozen=True)
 class TradeExecution:
     timestamp: datetime
     token: str
@@ -11,7 +17,7 @@ class TradeExecution:
     price: float
     # Removed slippage and fees for simplicity
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PortfolioState:
     cash: float
     token_balances: Dict[str, float]
@@ -36,15 +42,46 @@ class CryptoBacktesterSimplified:
         self.data_tools = data_tools # Assume agent and backtester still need to get data
         # Removed slippage_model
 
-        # Initialize portfolio
-        self.portfolio = {
-            "cash": initial_capital,
-            "tokens": {pair: 0 for pair in trading_pairs}
-        }
-        self.portfolio_history: List[PortfolioState] = []
+        # Initialize portfolio: cash plus one balance per pair, in trading_pairs order
+        self.cash = float(initial_capital)
+        self.pair_index = {pair: idx for idx, pair in enumerate(trading_pairs)}
+        self.balances = np.zeros(len(trading_pairs), dtype=np.float64)
+
+        # Per-step history, allocated by run_backtest once the number of steps is known
+        self.cash_hist = np.empty(0, dtype=np.float64)
+        self.balances_hist = np.empty((0, len(trading_pairs)), dtype=np.float64)
+        self.value_hist = np.empty(0, dtype=np.float64)
+        self.dates = np.empty(0, dtype='datetime64[us]')
+        self.steps_completed = 0 # History rows filled so far
         self.trades_history: List[TradeExecution] = []
 
-    async def execute_trade(
+    @property
+    def portfolio_history(self) -> List[PortfolioState]:
+        """Per-step snapshots, built from the history arrays on access."""
+        return [
+            PortfolioState(
+                cash=cash,
+                token_balances=dict(zip(self.trading_pairs, balances)),
+                total_value=total_value,
+                timestamp=timestamp
+            )
+            for timestamp, cash, balances, total_value in zip(
+                self.dates[:self.steps_completed].tolist(), # datetime64[us] -> datetime
+                self.cash_hist[:self.steps_completed].tolist(),
+                self.balances_hist[:self.steps_completed].tolist(),
+                self.value_hist[:self.steps_completed].tolist()
+            )
+        ]
+
+    @property
+    def portfolio(self) -> Dict:
+        """Snapshot of the portfolio in the {"cash", "tokens"} shape the agent expects."""
+        return {
+            "cash": self.cash,
+            "tokens": dict(zip(self.trading_pairs, self.balances.tolist()))
+        }
+
+    def execute_trade(
         self,
         token: str,
         action: str,
@@ -56,12 +93,13 @@ class CryptoBacktesterSimplified:
             return None
 
         executed_price = current_price # No slippage
+        idx = self.pair_index[token]
 
         if action == "buy":
             total_cost = quantity * executed_price
-            if total_cost <= self.portfolio["cash"]:
-                self.portfolio["cash"] -= total_cost
-                self.portfolio["tokens"][token] += quantity
+            if total_cost <= self.cash:
+                self.cash -= total_cost
+                self.balances[idx] += quantity
                 return TradeExecution(
                     timestamp=datetime.now(),
                     token=token,
@@ -71,10 +109,10 @@ class CryptoBacktesterSimplified:
                     # Removed slippage=0, fees=0
                 )
         elif action == "sell":
-            if quantity <= self.portfolio["tokens"][token]:
+            if quantity <= self.balances[idx]:
                 revenue = quantity * executed_price
-                self.portfolio["cash"] += revenue
-                self.portfolio["tokens"][token] -= quantity
+                self.cash += revenue
+                self.balances[idx] -= quantity
                 return TradeExecution(
                     timestamp=datetime.now(),
                     token=token,
@@ -85,21 +123,53 @@ class CryptoBacktesterSimplified:
                 )
         return None
 
+    async def load_price_matrix(self, n_steps: int) -> np.ndarray:
+        """Fetch hourly history for every pair up front as a (n_steps, n_pairs) price matrix.
+
+        Rows are oldest-first. A pair with a shorter history is right-aligned and
+        its missing leading rows take its oldest known price (0.0 if it has none).
+        """
+        histories = await asyncio.gather(
+            *(self.data_tools.get_historical_prices(token, n_steps) for token in self.trading_pairs)
+        )
+
+        prices = np.zeros((n_steps, len(self.trading_pairs)), dtype=np.float64)
+        for k, history in enumerate(histories):
+            series = history['price'].sort_index().to_numpy(dtype=np.float64)[-n_steps:]
+            if len(series):
+                prices[n_steps - len(series):, k] = series
+                prices[:n_steps - len(series), k] = series[0]
+        return prices
+
     async def run_backtest(self):
         """Simplified backtest simulation."""
-        dates = [self.start_date + timedelta(hours=i) for i in range(int((self.end_date - self.start_date).total_seconds() / 3600) + 1)]
+        n_steps = int((self.end_date - self.start_date).total_seconds() / 3600) + 1
+        dates = np.datetime64(self.start_date, 'us') + np.arange(n_steps) * np.timedelta64(1, 'h')
+
+        # One history fetch per pair instead of a metrics request per pair per hour
+        prices = await self.load_price_matrix(n_steps)
+        self.dates = dates
+        self.steps_completed = 0
+        self.cash_hist = np.empty(n_steps, dtype=np.float64)
+        self.balances_hist = np.empty((n_steps, len(self.trading_pairs)), dtype=np.float64)
+        self.value_hist = np.empty(n_steps, dtype=np.float64)
+
+        # Indicators over the whole history, computed once; row t is bar t
+        indicator_rows = {
+            token: indicator_series(pd.Series(prices[:, k])).to_dict('records')
+            for k, token in enumerate(self.trading_pairs)
+        }
 
         print("\nStarting simplified crypto backtest...")
         print(f"{'Date':<20} {'Token':<10} {'Action':<6} {'Quantity':>10} {'Price':>10} {'Portfolio Value':>15}")
         print("-" * 75)
 
-        for current_date in dates:
-            market_state = {}
-            for token in self.trading_pairs:
-                metrics = await self.data_tools.get_token_metrics(token) # Assume agent still needs price data
-                market_state[token] = {
-                    "price": metrics.price,
-                }
+        for t in range(n_steps):
+            row = prices[t].tolist()
+            market_state = {
+                token: {"price": price, "indicators": indicator_rows[token][t]}
+                for token, price in zip(self.trading_pairs, row)
+            }
 
             decisions = await self.agent.generate_trading_signals( # Agent still makes decisions
                 market_state=market_state,
@@ -107,7 +177,7 @@ class CryptoBacktesterSimplified:
             )
 
             for token, decision in decisions.items():
-                trade_execution = await self.execute_trade(
+                trade_execution = self.execute_trade(
                     token=token,
                     action=decision["action"],
                     quantity=decision["quantity"],
@@ -119,29 +189,23 @@ class CryptoBacktesterSimplified:
                     # Removed detailed trade print for extreme simplification
                     # print(f"Trade executed: {trade_execution}")
 
-            # Update portfolio state
-            total_value = self.portfolio["cash"]
-            for token in self.trading_pairs:
-                total_value += self.portfolio["tokens"][token] * market_state[token]["price"]
-
-            self.portfolio_history.append(
-                PortfolioState(
-                    cash=self.portfolio["cash"],
-                    token_balances=self.portfolio["tokens"].copy(),
-                    total_value=total_value,
-                    timestamp=current_date
-                )
-            )
-            print(f"{current_date:%Y-%m-%d %H:%M} Portfolio Value: {total_value:>15.2f}") # Simplified output
+            # Update portfolio state: mark to market with one dot product
+            total_value = self.cash + float(self.balances @ prices[t])
+            self.cash_hist[t] = self.cash
+            self.balances_hist[t] = self.balances
+            self.value_hist[t] = total_value
+            self.steps_completed = t + 1
+
+            print(f"{dates[t].item():%Y-%m-%d %H:%M} Portfolio Value: {total_value:>15.2f}") # Simplified output
 
 
     def analyze_performance(self):
         """Simplified performance analysis - just total return."""
-        if not self.portfolio_history:
+        if not self.steps_completed:
             return None
 
         start_value = self.initial_capital
-        end_value = self.portfolio_history[-1].total_value
+        end_value = float(self.value_hist[self.steps_completed - 1])
         total_return = (end_value - start_value) / start_value
 
         print("\nSimplified Performance Metrics:")
@@ -153,6 +217,7 @@ if __name__ == "__main__":
     # Simplified example usage, hardcoded parameters
     from tools import CryptoDataTools  # Assume tools and agent are still needed in simplified version
     from agents import SimpleTradingAgent as Agent # Assuming a simplified agent
+    from http_utils import close_session
 
     trading_pairs = ['SOL', 'BONK', 'JUP']
     end_date = datetime.now()
@@ -169,8 +234,13 @@ if __name__ == "__main__":
         data_tools=data_tools # Pass data tools
     )
 
-    import asyncio
-    asyncio.run(backtester.run_backtest())
+    async def _run():
+        try:
+            await backtester.run_backtest()
+        finally:
+            await close_session() # Shared HTTP session is closed once, at shutdown
+
+    asyncio.run(_run())
     performance_return = backtester.analyze_performance() # Get return value
     if performance_return is not None:
         print(f"Backtest completed, total return: {performance_return:.2%}")
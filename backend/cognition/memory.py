@@ -1,19 +1,133 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from datetime import datetime
 from dataclasses import dataclass
 import logging
+import time
 from collections import deque
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+_MISSING = object()  # Marks a key absent from one memory's data
+
+@dataclass(slots=True, frozen=True)
 class MemoryEntry:
     """Single memory entry."""
-    timestamp: str
+    timestamp: int  # Epoch nanoseconds (time.time_ns())
     type: str  
     data: Dict[str, Any]
     importance: float  
     metadata: Optional[Dict] = None
+    
+    @property
+    def timestamp_iso(self) -> str:
+        """Local-time ISO form of `timestamp`, for display and serialization."""
+        return datetime.fromtimestamp(self.timestamp / 1e9).isoformat()
+
+class _MemoryRing:
+    """Fixed-capacity FIFO memory store kept as parallel columns.
+    
+    Behaves like a deque(maxlen=capacity): appending to a full ring overwrites
+    the oldest slot. Nothing is stored per entry beyond the column values;
+    `MemoryEntry` objects are only built when a caller asks for them.
+    """
+    
+    def __init__(self, capacity: int, type_names: List[str]):
+        self.capacity = capacity
+        self.type_names = type_names  # Shared type_id -> type lookup
+        self.uid = np.zeros(capacity, dtype=np.int64)  # Shared by both rings for one add
+        self.ts = np.zeros(capacity, dtype=np.int64)  # Epoch nanoseconds
+        self.type_id = np.zeros(capacity, dtype=np.int32)
+        self.token_id = np.zeros(capacity, dtype=np.int32)
+        self.importance = np.zeros(capacity, dtype=np.float64)
+        self.data: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.metadata: List[Optional[Dict]] = [None] * capacity
+        self._next = 0  # Slot written by the next append
+        self._size = 0
+        
+    def __len__(self) -> int:
+        return self._size
+        
+    def __iter__(self) -> Iterator[MemoryEntry]:
+        return (self.entry(i) for i in self.slots().tolist())
+        
+    def append(
+        self,
+        uid: int,
+        ts: int,
+        type_id: int,
+        token_id: int,
+        importance: float,
+        data: Dict[str, Any],
+        metadata: Optional[Dict] = None
+    ):
+        """Store one memory, evicting the oldest when full."""
+        if not self.capacity:
+            return
+        i = self._next
+        self.uid[i] = uid
+        self.ts[i] = ts
+        self.type_id[i] = type_id
+        self.token_id[i] = token_id
+        self.importance[i] = importance
+        self.data[i] = data
+        self.metadata[i] = metadata
+        self._next = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        
+    def extend(
+        self,
+        uid: np.ndarray,
+        ts: int,
+        type_id: np.ndarray,
+        token_id: np.ndarray,
+        importance: np.ndarray,
+        data: List[Dict[str, Any]],
+        metadata: List[Optional[Dict]]
+    ):
+        """Store several memories (oldest first) sharing one timestamp, like
+        repeated `append` calls."""
+        n = len(data)
+        if not self.capacity or not n:
+            return
+        if n > self.capacity:
+            # Only the newest `capacity` entries would survive anyway
+            skip = n - self.capacity
+            uid, type_id, token_id, importance = uid[skip:], type_id[skip:], token_id[skip:], importance[skip:]
+            data, metadata = data[skip:], metadata[skip:]
+            n = self.capacity
+        slots = (self._next + np.arange(n)) % self.capacity
+        self.uid[slots] = uid
+        self.ts[slots] = ts
+        self.type_id[slots] = type_id
+        self.token_id[slots] = token_id
+        self.importance[slots] = importance
+        for slot, d, m in zip(slots.tolist(), data, metadata):
+            self.data[slot] = d
+            self.metadata[slot] = m
+        self._next = (self._next + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+        
+    def clear(self):
+        self.data = [None] * self.capacity
+        self.metadata = [None] * self.capacity
+        self._next = 0
+        self._size = 0
+        
+    def slots(self) -> np.ndarray:
+        """Physical slot of every stored entry, oldest first."""
+        start = self._next - self._size
+        return (start + np.arange(self._size)) % max(self.capacity, 1)
+        
+    def entry(self, slot: int) -> MemoryEntry:
+        """Materialize the memory stored at `slot`."""
+        return MemoryEntry(
+            timestamp=int(self.ts[slot]),
+            type=self.type_names[self.type_id[slot]],
+            data=self.data[slot],
+            importance=float(self.importance[slot]),
+            metadata=self.metadata[slot]
+        )
 
 class MemorySystem:
     """Advanced memory system for autonomous trading agent."""
@@ -29,43 +143,73 @@ class MemorySystem:
         self.consolidation_interval = consolidation_interval
         
         
-        self.short_term = deque(maxlen=100)  
-        self.long_term = deque(maxlen=max_size)  
+        # Interned ids for the type/token columns
+        self._type_ids: Dict[str, int] = {}
+        self._type_names: List[str] = []
+        self._token_ids: Dict[Any, int] = {}
+        self._next_uid = 0
+        
+        self.short_term = _MemoryRing(100, self._type_names)
+        self.long_term = _MemoryRing(max_size, self._type_names)
         
        
         self.metrics = {
-            'trades': [],
+            'trades': deque(maxlen=max_size),  # Recent trades, for inspection only
             'win_rate': 0.0,
             'avg_profit': 0.0,
             'total_trades': 0
         }
+        # Running aggregates behind win_rate / avg_profit
+        self._profit_sum = 0.0
+        self._win_count = 0
         
     async def add(self, entry_type: str, data: Dict[str, Any], metadata: Optional[Dict] = None) -> None:
         """Add new memory entry."""
+        await self.add_many([(entry_type, data, metadata)])
+        
+    async def add_many(self, entries: List[tuple]) -> None:
+        """Add several memories at once.
+        
+        `entries` holds `(entry_type, data)` or `(entry_type, data, metadata)`
+        tuples, oldest first. The batch shares one timestamp, is scored in one
+        vectorized pass and is written to the rings in bulk; consolidation
+        still runs whenever short-term memory reaches the interval.
+        """
         try:
-         
-            importance = self._calculate_importance(entry_type, data)
-            
-            entry = MemoryEntry(
-                timestamp=datetime.now().isoformat(),
-                type=entry_type,
-                data=data,
-                importance=importance,
-                metadata=metadata
-            )
+            if not entries:
+                return
+            now = time.time_ns()
+            n = len(entries)
+            types = [entry[0] for entry in entries]
+            datas = [entry[1] for entry in entries]
+            metas = [entry[2] if len(entry) > 2 else None for entry in entries]
             
-          
-            self.short_term.append(entry)
+            importance = self._calculate_importances(types, datas)
+            uid = np.arange(self._next_uid, self._next_uid + n, dtype=np.int64)
+            self._next_uid += n
+            type_id = np.fromiter((self._intern_type(t) for t in types), dtype=np.int32, count=n)
+            token_id = np.fromiter((self._intern_token(d.get('token')) for d in datas), dtype=np.int32, count=n)
             
-
-            if importance >= self.importance_threshold:
-                self.long_term.append(entry)
-           
-            if entry_type == 'trade':
+            important = np.flatnonzero(importance >= self.importance_threshold)
+            self.long_term.extend(
+                uid[important], now, type_id[important], token_id[important], importance[important],
+                [datas[i] for i in important.tolist()], [metas[i] for i in important.tolist()]
+            )
+            
+            for data in (d for t, d in zip(types, datas) if t == 'trade'):
                 self._update_metrics(data)
-          
-            if len(self.short_term) >= self.consolidation_interval:
-                await self._consolidate_memories()
+                
+            # Write short-term in runs that end where a one-by-one add would consolidate
+            start = 0
+            while start < n:
+                stop = min(n, start + max(1, self.consolidation_interval - len(self.short_term)))
+                self.short_term.extend(
+                    uid[start:stop], now, type_id[start:stop], token_id[start:stop],
+                    importance[start:stop], datas[start:stop], metas[start:stop]
+                )
+                if len(self.short_term) >= self.consolidation_interval:
+                    await self._consolidate_memories()
+                start = stop
                 
         except Exception as e:
             logger.error(f"Error adding memory: {e}")
@@ -76,32 +220,65 @@ class MemorySystem:
         limit: int = 5,
         memory_types: Optional[List[str]] = None
     ) -> List[MemoryEntry]:
-        """Get memories relevant to current context."""
-        scored_memories = []
+        """Get memories relevant to current context.
         
-     
-        memories = list(self.short_term) + list(self.long_term)
+        Scores every stored memory in one vectorized pass over the ring
+        columns; same weights as `_calculate_relevance`.
+        """
+        short_slots = self.short_term.slots()
+        long_slots = self.long_term.slots()
+        # Important memories sit in both rings under one uid; score each only once
+        long_slots = long_slots[~np.isin(self.long_term.uid[long_slots], self.short_term.uid[short_slots])]
+        n_short = len(short_slots)
+        data = (
+            [self.short_term.data[i] for i in short_slots.tolist()] +
+            [self.long_term.data[i] for i in long_slots.tolist()]
+        )
+        ts = np.concatenate((self.short_term.ts[short_slots], self.long_term.ts[long_slots]))
+        type_id = np.concatenate((self.short_term.type_id[short_slots], self.long_term.type_id[long_slots]))
+        token_id = np.concatenate((self.short_term.token_id[short_slots], self.long_term.token_id[long_slots]))
         
-        for memory in memories:
-            if memory_types and memory.type not in memory_types:
-                continue
-                
-            relevance = self._calculate_relevance(memory, context)
-            scored_memories.append((relevance, memory))
-  
-        sorted_memories = sorted(scored_memories, key=lambda x: x[0], reverse=True)
-        unique_memories = []
-        seen = set()
-        
-        for _, memory in sorted_memories:
-            memory_key = f"{memory.timestamp}_{memory.type}"
-            if memory_key not in seen:
-                unique_memories.append(memory)
-                seen.add(memory_key)
-                if len(unique_memories) >= limit:
-                    break
+        time_diff = (time.time_ns() - ts) * 1e-9
+        scores = 0.3 * np.clip(1 - time_diff / (24 * 3600), 0, None)
+        
+        if 'token' in context:
+            scores += 0.3 * (token_id == self._token_ids.get(context['token'], -1))
+            
+        if 'type' in context:
+            scores += 0.2 * (type_id == self._type_ids.get(context['type'], -1))
+            
+        if 'market_conditions' in context:
+            for i, memory_data in enumerate(data):
+                if 'market_conditions' in memory_data:
+                    scores[i] += 0.2 * self._compare_market_conditions(
+                        context['market_conditions'],
+                        memory_data['market_conditions']
+                    )
                     
-        return unique_memories
+        np.minimum(scores, 1.0, out=scores)
+        
+        candidates = np.arange(len(data))
+        if memory_types:
+            wanted = [self._type_ids[t] for t in memory_types if t in self._type_ids]
+            candidates = np.flatnonzero(np.isin(type_id, wanted))
+            
+        # Partial sort: only the top `limit` candidates are ordered, highest
+        # score first with ties in short-term-then-long-term order
+        candidate_scores = scores[candidates]
+        k = min(limit, len(candidates))
+        if k <= 0:
+            return []
+        if k < len(candidates):
+            top = np.argpartition(-candidate_scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        order = candidates[top[np.lexsort((top, -candidate_scores[top]))]]
+        
+        return [
+            self.short_term.entry(short_slots[i]) if i < n_short
+            else self.long_term.entry(long_slots[i - n_short])
+            for i in order.tolist()
+        ]
         
     def get_recent_memories(self, limit: int = 10) -> List[MemoryEntry]:
         """Get most recent memories."""
@@ -113,31 +290,43 @@ class MemorySystem:
         
     def _calculate_importance(self, entry_type: str, data: Dict[str, Any]) -> float:
         """Calculate memory importance score."""
-        importance = 0.5  
+        return float(self._calculate_importances([entry_type], [data])[0])
         
-        if entry_type == 'trade':
-            trade_size = abs(float(data.get('size', 0)))
-            profit = float(data.get('profit', 0))
-            importance += min(0.3, trade_size / 10000) 
-            importance += min(0.2, abs(profit) / 1000)  
+    def _calculate_importances(self, entry_types: List[str], datas: List[Dict[str, Any]]) -> np.ndarray:
+        """Importance score of every (entry_type, data) pair, as one array."""
+        n = len(datas)
+        kinds = np.asarray(entry_types, dtype=object)
+        trade = kinds == 'trade'
+        analysis = kinds == 'analysis'
+        
+        def column(key: str, rows: np.ndarray) -> np.ndarray:
+            # Only the rows of the matching type are converted; other types may use the key freely
+            return np.fromiter(
+                (self._numeric(d, key) if r else 0.0 for d, r in zip(datas, rows.tolist())),
+                dtype=np.float64,
+                count=n
+            )
             
-        elif entry_type == 'error':
-            importance += 0.3
+        importance = np.full(n, 0.5)
+        
+        if trade.any():
+            importance += np.where(trade, np.minimum(0.3, np.abs(column('size', trade)) / 10000), 0.0)
+            importance += np.where(trade, np.minimum(0.2, np.abs(column('profit', trade)) / 1000), 0.0)
             
-        elif entry_type == 'analysis':
-            confidence = float(data.get('confidence', 0))
-            risk_score = float(data.get('risk_score', 0))
-            importance += 0.2 * confidence
-            importance += 0.2 * risk_score
+        importance += np.where(kinds == 'error', 0.3, 0.0)
+        
+        if analysis.any():
+            importance += np.where(analysis, 0.2 * column('confidence', analysis), 0.0)
+            importance += np.where(analysis, 0.2 * column('risk_score', analysis), 0.0)
             
-        return min(1.0, importance)
+        return np.minimum(1.0, importance)
         
     def _calculate_relevance(self, memory: MemoryEntry, context: Dict[str, Any]) -> float:
         """Calculate memory relevance to current context."""
         relevance = 0.0
         
 
-        time_diff = (datetime.now() - datetime.fromisoformat(memory.timestamp)).total_seconds()
+        time_diff = (time.time_ns() - memory.timestamp) * 1e-9
         time_factor = max(0, 1 - (time_diff / (24 * 3600)))  
         relevance += 0.3 * time_factor
         
@@ -159,89 +348,121 @@ class MemorySystem:
         return min(1.0, relevance)
         
     async def _consolidate_memories(self):
-        """Consolidate and clean up memories."""
+        """Consolidate and clean up memories.
+        
+        Short-term memories sharing a type and token are merged into one
+        entry and singletons are dropped. Rows are grouped by sorting one
+        integer key per row, so every group is a contiguous run that NumPy
+        reductions can aggregate.
+        """
         try:
+            ring = self.short_term
+            slots = ring.slots()
+            if not slots.size:
+                return
+            keys = ring.type_id[slots].astype(np.int64) * max(len(self._token_ids), 1) + ring.token_id[slots]
+            _, first, inverse, counts = np.unique(
+                keys, return_index=True, return_inverse=True, return_counts=True
+            )
             
-            consolidated = []
-            groups = {}
+            # Number groups by first appearance, as the old dict groupby ordered them
+            by_first = np.argsort(first)
+            group = np.empty_like(by_first)
+            group[by_first] = np.arange(by_first.size)
+            counts = counts[by_first]
+            order = slots[np.argsort(group[inverse.ravel()], kind='stable')]
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            keep = np.flatnonzero(counts > 1)
             
-            for memory in self.short_term:
-                key = f"{memory.type}_{memory.data.get('token', '')}"
-                if key not in groups:
-                    groups[key] = []
-                groups[key].append(memory)
-                
-       
-            for group in groups.values():
-                if len(group) > 1:
-                    consolidated_data = self._merge_memory_data(group)
-                    importance = max(m.importance for m in group)
-                    
-                    consolidated.append(MemoryEntry(
-                        timestamp=datetime.now().isoformat(),
-                        type=group[0].type,
-                        data=consolidated_data,
-                        importance=importance
-                    ))
-                    
-
-            self.short_term.clear()
-            self.short_term.extend(consolidated)
+            merged = self._merge_memory_data([ring.data[i] for i in order.tolist()], starts)
+            importance = np.maximum.reduceat(ring.importance[order], starts)[keep]
+            type_id = ring.type_id[order[starts]][keep]
+            token_id = ring.token_id[order[starts]][keep]
+            uid = np.arange(self._next_uid, self._next_uid + keep.size, dtype=np.int64)
+            self._next_uid += keep.size
+            
+            ring.clear()
+            ring.extend(
+                uid, time.time_ns(), type_id, token_id, importance,
+                [merged[g] for g in keep.tolist()], [None] * keep.size
+            )
             
         except Exception as e:
             logger.error(f"Error consolidating memories: {e}")
             
-    def _merge_memory_data(self, memories: List[MemoryEntry]) -> Dict[str, Any]:
-        """Merge similar memory data."""
-        merged = {}
-        for memory in memories:
-            for key, value in memory.data.items():
-                if key not in merged:
-                    merged[key] = []
-                if isinstance(value, (int, float)):
-                    merged[key].append(value)
-                else:
-                    merged[key] = value
-                    
-
-        for key, value in merged.items():
-            if isinstance(value, list) and value and isinstance(value[0], (int, float)):
-                merged[key] = sum(value) / len(value)
+    def _intern_type(self, entry_type: str) -> int:
+        """Id of `entry_type` in the type column, assigning one on first sight."""
+        type_id = self._type_ids.get(entry_type)
+        if type_id is None:
+            type_id = self._type_ids[entry_type] = len(self._type_names)
+            self._type_names.append(entry_type)
+        return type_id
+        
+    def _intern_token(self, token: Any) -> int:
+        """Id of `token` in the token column, assigning one on first sight."""
+        return self._token_ids.setdefault(token, len(self._token_ids))
+        
+    def _merge_memory_data(self, datas: List[Dict[str, Any]], starts: np.ndarray) -> List[Dict[str, Any]]:
+        """Merge the data of each group of similar memories.
+        
+        `datas` is sorted so each group is a contiguous run beginning at its
+        entry in `starts`. Numbers are averaged per group; when a key's last
+        value in a group is not a number, that value is kept instead.
+        """
+        n = len(datas)
+        merged: List[Dict[str, Any]] = [{} for _ in range(starts.size)]
+        rows = np.arange(n)
+        
+        for key in dict.fromkeys(k for data in datas for k in data):
+            values = [data.get(key, _MISSING) for data in datas]
+            numeric = np.fromiter((isinstance(v, (int, float)) for v in values), dtype=bool, count=n)
+            present = np.fromiter((v is not _MISSING for v in values), dtype=bool, count=n)
+            numbers = np.fromiter(
+                (v if isinstance(v, (int, float)) else 0.0 for v in values), dtype=np.float64, count=n
+            )
+            
+            sums = np.add.reduceat(numbers, starts)
+            counts = np.add.reduceat(numeric, starts)
+            last = np.maximum.reduceat(np.where(present, rows, -1), starts)
+            
+            for g, i in enumerate(last.tolist()):
+                if i < 0:
+                    continue
+                merged[g][key] = float(sums[g] / counts[g]) if numeric[i] else values[i]
                 
         return merged
         
     def _update_metrics(self, trade_data: Dict[str, Any]):
-        """Update performance metrics."""
+        """Update performance metrics in O(1) from running sums."""
         self.metrics['total_trades'] += 1
         self.metrics['trades'].append(trade_data)
         
-    
-        if 'profit' in trade_data:
-            profit = float(trade_data['profit'])
-            if profit > 0:
-                self.metrics['win_rate'] = (
-                    (self.metrics['win_rate'] * (self.metrics['total_trades'] - 1) + 1) /
-                    self.metrics['total_trades']
-                )
-            else:
-                self.metrics['win_rate'] = (
-                    self.metrics['win_rate'] * (self.metrics['total_trades'] - 1) /
-                    self.metrics['total_trades']
-                )
-                
-
-        profits = [float(t.get('profit', 0)) for t in self.metrics['trades']]
-        self.metrics['avg_profit'] = sum(profits) / len(profits) if profits else 0
+        profit = self._numeric(trade_data, 'profit')
+        self._profit_sum += profit
+        if profit > 0:
+            self._win_count += 1
+            
+        n = self.metrics['total_trades']
+        self.metrics['avg_profit'] = self._profit_sum / n
+        self.metrics['win_rate'] = self._win_count / n
         
     @staticmethod
     def _compare_market_conditions(cond1: Dict[str, Any], cond2: Dict[str, Any]) -> float:
         """Compare similarity of market conditions."""
-        try:
-            metrics = ['trend', 'volatility', 'volume', 'sentiment']
-            matches = sum(
-                1 for m in metrics
-                if m in cond1 and m in cond2 and cond1[m] == cond2[m]
-            )
-            return matches / len(metrics)
-        except Exception:
-            return 0.0
\ No newline at end of file
+        if not isinstance(cond1, dict) or not isinstance(cond2, dict):
+            return 0.0
+        metrics = ['trend', 'volatility', 'volume', 'sentiment']
+        matches = sum(
+            1 for m in metrics
+            if m in cond1 and m in cond2 and cond1[m] == cond2[m]
+        )
+        return matches / len(metrics)
+        
+    @staticmethod
+    def _numeric(data: Dict[str, Any], key: str) -> float:
+        """`data[key]` as a float (numbers, Decimals and numeric strings alike);
+        0.0 when missing or None. Anything else raises ValueError/TypeError."""
+        value = data.get(key)
+        if value is None:
+            return 0.0
+        return float(value)
\ No newline at end of file
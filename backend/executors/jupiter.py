@@ -2,32 +2,68 @@
 import asyncio
 import aiohttp
 import logging
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, Tuple, Union
 from decimal import Decimal
-import json
+import orjson
+
+from http_utils import JUPITER_LIMITER, TTLCache, get_session, request_with_retry
 
 logger = logging.getLogger(__name__)
 
+def _raw_amount(value: Union[int, float, str]) -> Union[int, Decimal]:
+    """Parse a raw (lamport) amount as an int.
+    
+    Jupiter amounts are integer strings, so this is one `int()`; only
+    non-integer input such as a user-supplied "1.5" falls back to Decimal.
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    return Decimal(str(value))
+
 class JupiterExecutor:
     """Jupiter Protocol trade execution handler."""
     
-    def __init__(self, config: Optional[Dict] = None):
+    def __init__(
+        self,
+        config: Optional[Dict] = None,
+        session: Optional[aiohttp.ClientSession] = None
+    ):
         self.config = config or {}
         self.base_url = "https://quote-api.jup.ag/v6"
-        self.session = None
+        self.session = session  # None: use the process-wide shared session
+        self._limiter = JUPITER_LIMITER  # Jupiter API budget, shared across clients
         self.slippage_bps = self.config.get('slippage_bps', 50)  # 0.5%
         self.max_retries = self.config.get('max_retries', 3)
+        # Recent (quote, swap_tx) per trade, shared by simulate_swap and execute_trade
+        self._swap_cache = TTLCache(self.config.get('quote_ttl', 2.0))
         
-    async def ensure_session(self):
-        """Ensure aiohttp session is initialized."""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+    async def ensure_session(self) -> aiohttp.ClientSession:
+        """Ensure aiohttp session is initialized (the shared one by default)."""
+        if self.session is None or self.session.closed:
+            self.session = await get_session()
+        return self.session
 
     async def close(self):
-        """Close the session."""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Detach from the session; the shared one is closed at shutdown."""
+        self.session = None
+
+    async def _request(self, method: str, path: str, **kwargs) -> Tuple[int, bytes]:
+        """Rate-limited Jupiter API call, retried `max_retries` times on
+        transient failures; returns (status, body)."""
+        session = await self.ensure_session()
+        return await request_with_retry(
+            session,
+            method,
+            f"{self.base_url}{path}",
+            limiter=self._limiter,
+            max_retries=self.max_retries,
+            **kwargs
+        )
 
     async def execute_trade(
         self,
@@ -39,28 +75,15 @@ class JupiterExecutor:
     ) -> Dict:
         """Execute a trade through Jupiter."""
         try:
-            await self.ensure_session()
-            
-            # Get quote
-            quote = await self.get_quote(
-                input_token=input_token,
-                output_token=output_token,
-                amount=str(amount),
-                slippage_bps=self.slippage_bps,
-                exact_out=exact_out
+            # Quote and swap transaction, reusing a just-simulated pair if there is one
+            quote, swap_tx = await self._quote_and_tx(
+                input_token,
+                output_token,
+                amount,
+                user_public_key,
+                exact_out=exact_out,
+                consume=True
             )
-            
-            if not quote:
-                raise Exception("Failed to get quote")
-                
-            # Get swap transaction
-            swap_tx = await self.get_swap_transaction(
-                quote_response=quote,
-                user_public_key=user_public_key
-            )
-            
-            if not swap_tx:
-                raise Exception("Failed to get swap transaction")
                 
             # Execute swap
             result = await self.execute_swap(swap_tx)
@@ -73,11 +96,11 @@ class JupiterExecutor:
                 'amount_out': quote['outAmount'],
                 'price_impact': quote.get('priceImpactPct', '0'),
                 'tx_hash': result.get('txid'),
-                'executed_price': Decimal(quote['outAmount']) / Decimal(amount)
+                'executed_price': float(int(quote['outAmount']) / _raw_amount(amount))
             }
             
         except Exception as e:
-            logger.error(f"Trade execution failed: {e}")
+            logger.error("Trade execution failed: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -86,6 +109,51 @@ class JupiterExecutor:
                 'amount_in': amount
             }
 
+    async def _quote_and_tx(
+        self,
+        input_token: str,
+        output_token: str,
+        amount: Union[int, float, str],
+        user_public_key: str,
+        exact_out: bool = False,
+        consume: bool = False
+    ) -> Tuple[Dict, Dict]:
+        """(quote, swap_tx) for a trade, from cache when the same trade was
+        prepared within `quote_ttl` seconds.
+        
+        Simulation caches what it fetches. Execution (`consume=True`) takes
+        the entry out of the cache, so a built transaction is never handed
+        out twice. Raises if the quote or transaction can't be fetched.
+        """
+        key = (input_token, output_token, str(amount), self.slippage_bps, exact_out, user_public_key)
+        cached = self._swap_cache.pop(key) if consume else self._swap_cache.get(key)
+        if cached is not None:
+            return cached
+            
+        quote = await self.get_quote(
+            input_token=input_token,
+            output_token=output_token,
+            amount=str(amount),
+            slippage_bps=self.slippage_bps,
+            exact_out=exact_out
+        )
+        
+        if not quote:
+            raise Exception("Failed to get quote")
+            
+        swap_tx = await self.get_swap_transaction(
+            quote_response=quote,
+            user_public_key=user_public_key
+        )
+        
+        if not swap_tx:
+            raise Exception("Failed to get swap transaction")
+            
+        prepared = (quote, swap_tx)
+        if not consume:
+            self._swap_cache.put(key, prepared)
+        return prepared
+
     async def get_quote(
         self,
         input_token: str,
@@ -104,16 +172,15 @@ class JupiterExecutor:
                 'swapMode': 'ExactOut' if exact_out else 'ExactIn'
             }
             
-            async with self.session.get(f"{self.base_url}/quote", params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Quote error: {error_text}")
-                    return None
+            status, body = await self._request('GET', '/quote', params=params)
+            if status == 200:
+                return orjson.loads(body)
+            else:
+                logger.error("Quote error: %s", body.decode(errors='replace'))
+                return None
                     
         except Exception as e:
-            logger.error(f"Error getting quote: {e}")
+            logger.error("Error getting quote: %s", e)
             return None
 
     async def get_swap_transaction(
@@ -132,19 +199,15 @@ class JupiterExecutor:
                 'prioritizationFeeLamports': 'auto'
             }
             
-            async with self.session.post(
-                f"{self.base_url}/swap",
-                json=payload
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Swap transaction error: {error_text}")
-                    return None
+            status, body = await self._request('POST', '/swap', json=payload)
+            if status == 200:
+                return orjson.loads(body)
+            else:
+                logger.error("Swap transaction error: %s", body.decode(errors='replace'))
+                return None
                     
         except Exception as e:
-            logger.error(f"Error getting swap transaction: {e}")
+            logger.error("Error getting swap transaction: %s", e)
             return None
 
     async def execute_swap(self, swap_tx: Dict) -> Dict:
@@ -162,11 +225,11 @@ class JupiterExecutor:
                 
             except Exception as e:
                 if attempt == self.max_retries - 1:
-                    logger.error(f"Max retries reached for swap execution: {e}")
+                    logger.error("Max retries reached for swap execution: %s", e)
                     raise
                     
                 wait_time = 2 ** attempt  # Exponential backoff
-                logger.warning(f"Retry {attempt + 1}/{self.max_retries} in {wait_time}s")
+                logger.warning("Retry %d/%d in %ss", attempt + 1, self.max_retries, wait_time)
                 await asyncio.sleep(wait_time)
 
     async def check_transaction_status(self, tx_hash: str) -> Dict:
@@ -179,7 +242,7 @@ class JupiterExecutor:
                 'slot': 123456789
             }
         except Exception as e:
-            logger.error(f"Error checking transaction status: {e}")
+            logger.error("Error checking transaction status: %s", e)
             return {
                 'status': 'unknown',
                 'error': str(e)
@@ -192,27 +255,19 @@ class JupiterExecutor:
         amount: str,
         user_public_key: str
     ) -> Dict:
-        """Simulate swap to estimate costs and outcomes."""
+        """Simulate swap to estimate costs and outcomes.
+        
+        Network I/O only happens on a cache miss; the prepared quote and
+        transaction are then reused by an `execute_trade` for the same trade.
+        """
         try:
-            # Get quote first
-            quote = await self.get_quote(
-                input_token=input_token,
-                output_token=output_token,
-                amount=amount
+            quote, swap_tx = await self._quote_and_tx(
+                input_token,
+                output_token,
+                amount,
+                user_public_key
             )
             
-            if not quote:
-                raise Exception("Failed to get quote for simulation")
-                
-            # Get swap transaction
-            swap_tx = await self.get_swap_transaction(
-                quote_response=quote,
-                user_public_key=user_public_key
-            )
-            
-            if not swap_tx:
-                raise Exception("Failed to get swap transaction for simulation")
-                
             return {
                 'success': True,
                 'input_amount': amount,
@@ -221,12 +276,13 @@ class JupiterExecutor:
                 'minimum_output': quote.get('otherAmountThreshold', '0'),
                 'estimated_fees': {
                     'network': swap_tx.get('prioritizationFeeLamports', 0),
-                    'platform': quote.get('platformFee', {'amount': '0'})['amount']
+                    # Jupiter sends "platformFee": null when no platform fee is set
+                    'platform': (quote.get('platformFee') or {}).get('amount', '0')
                 }
             }
             
         except Exception as e:
-            logger.error(f"Simulation failed: {e}")
+            logger.error("Simulation failed: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -239,13 +295,13 @@ class JupiterExecutor:
     ) -> bool:
         """Validate trade amounts."""
         try:
-            amount_in_dec = Decimal(str(amount_in))
-            min_amount_dec = Decimal(str(min_amount))
+            amount_in_raw = _raw_amount(amount_in)
+            min_amount_raw = _raw_amount(min_amount)
             
-            if amount_in_dec <= 0 or min_amount_dec <= 0:
+            if amount_in_raw <= 0 or min_amount_raw <= 0:
                 return False
                 
-            if min_amount_dec > amount_in_dec:
+            if min_amount_raw > amount_in_raw:
                 return False
                 
             return True
@@ -1,21 +1,119 @@
 # src/executors/jupiter_client.py
+import asyncio
 import decimal
 import aiohttp
 import logging
-from typing import Dict, List, Optional, Union
+import orjson
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
 from decimal import Decimal
 from dataclasses import dataclass
 
+from http_utils import DEFAULT_TIMEOUT, JUPITER_LIMITER, TTLCache, get_session, request_with_retry
+
 logger = logging.getLogger(__name__)
 
-TOKEN_MINTS = {
-    'SOL': 'So11111111111111111111111111111111111111112',
-    'USDC': 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v',
-    'BONK': 'DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263',
-    'JUP': 'JUPyiwrYJFskUPiHa9toL3DeNMzPARXD7wqBqkSwkcj'
-}
+# Symbol -> (mint address, decimals)
+TOKEN_INFO = MappingProxyType({
+    'SOL': ('So11111111111111111111111111111111111111112', 9),
+    'USDC': ('EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v', 6),
+    'BONK': ('DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263', 5),
+    'JUP': ('JUPyiwrYJFskUPiHa9toL3DeNMzPARXD7wqBqkSwkcj', 6)
+})
+TOKEN_MINTS = MappingProxyType({symbol: mint for symbol, (mint, _) in TOKEN_INFO.items()})
+DEFAULT_DECIMALS = 9  # Assumed for tokens given by raw mint address
+
+# Fixed /swap and /swap-instructions fields, JSON-encoded once (object body without braces)
+_SWAP_DEFAULTS = MappingProxyType({
+    "wrapAndUnwrapSol": True,
+    "useSharedAccounts": True,
+    "dynamicComputeUnitLimit": True,
+    "skipUserAccountsRpcCalls": True,
+    "prioritizationFeeLamports": "auto"
+})
+_SWAP_DEFAULTS_JSON = orjson.dumps(dict(_SWAP_DEFAULTS))[1:-1]
+_INSTRUCTIONS_DEFAULTS = MappingProxyType({
+    "computeUnitPriceMicroLamports": "auto",
+    "dynamicComputeUnitLimit": True
+})
+_INSTRUCTIONS_DEFAULTS_JSON = orjson.dumps(dict(_INSTRUCTIONS_DEFAULTS))[1:-1]
+_JSON_HEADERS = MappingProxyType({'Content-Type': 'application/json'})
+
+# Static data served when use_mock is set
+_MOCK_PRICES = MappingProxyType({'SOL': 90.0, 'BONK': 0.000012, 'JUP': 1.20})
+_MOCK_VOLUMES = MappingProxyType({'SOL': 150000000.0, 'BONK': 25000000.0, 'JUP': 5000000.0})
+_MOCK_LIQUIDITY = MappingProxyType({'SOL': 500000000.0, 'BONK': 50000000.0, 'JUP': 10000000.0})
+
+async def coalesce(
+    inflight: Dict[Hashable, asyncio.Future],
+    key: Hashable,
+    factory: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Share one in-flight call per key among concurrent callers.
+    
+    The first caller starts `factory()` as a task; later callers await the
+    same task until it finishes and the key is released.
+    """
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    # Shield so one caller being cancelled doesn't cancel the shared request
+    return await asyncio.shield(task)
+
+async def run_bounded(aws: Iterable[Awaitable], limit: int = 32) -> List[Any]:
+    """Await every item of `aws` with at most `limit` in flight at once.
+    
+    Jobs are queued and drained by `limit` workers. Results come back in
+    input order, with exceptions returned in place like
+    `gather(..., return_exceptions=True)`.
+    """
+    jobs = list(aws)
+    results: List[Any] = [None] * len(jobs)
+    queue: asyncio.Queue = asyncio.Queue()
+    for job in enumerate(jobs):
+        queue.put_nowait(job)
+        
+    async def worker():
+        while not queue.empty():
+            i, job = queue.get_nowait()
+            try:
+                results[i] = await job
+            except Exception as e:
+                results[i] = e
+                
+    await asyncio.gather(*(worker() for _ in range(min(limit, len(jobs)))))
+    return results
+
+def unit_price(
+    in_amount: Union[int, str],
+    out_amount: Union[int, str],
+    in_scale: int,
+    out_scale: int
+) -> float:
+    """`(in_amount / in_scale) / (out_amount / out_scale)` for raw quote amounts.
+    
+    Jupiter amounts are integer strings, so the ratio is taken with exact
+    int math and one correctly rounded division; Decimal is only used for
+    amounts with a fractional part.
+    """
+    try:
+        return (int(in_amount) * out_scale) / (int(out_amount) * in_scale)
+    except ValueError:
+        return float((Decimal(in_amount) / in_scale) / (Decimal(out_amount) / out_scale))
+
+def _encode_payload(fields: Dict, defaults: MappingProxyType, defaults_json: bytes) -> bytes:
+    """JSON body for `{**defaults, **fields}`, splicing in the pre-encoded defaults.
+    
+    Only `fields` is encoded per call; if it overrides a default, the whole
+    payload is encoded instead so no key appears twice.
+    """
+    if fields.keys() & defaults.keys():
+        return orjson.dumps({**defaults, **fields})
+    return orjson.dumps(fields)[:-1] + b',' + defaults_json + b'}'
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TokenMetrics:
     """Token metrics data class."""
     price: float
@@ -66,40 +164,146 @@ class TokenMetricsService:
         self, 
         tokens: List[str]
     ) -> Dict[str, TokenMetrics]:
-        """Get metrics for multiple tokens."""
+        """Get metrics for multiple tokens, fetched concurrently (bounded by
+        the client's `max_concurrency`)."""
+        results = await run_bounded(
+            (self.get_token_metrics(token) for token in tokens),
+            self.jupiter.max_concurrency
+        )
         metrics = {}
-        for token in tokens:
-            metrics[token] = await self.get_token_metrics(token)
+        for token, result in zip(tokens, results):
+            if isinstance(result, Exception):
+                result = TokenMetrics(
+                    price=0.0,
+                    volume_24h=0.0,
+                    liquidity=0.0,
+                    holders=0,
+                    transactions_24h=0,
+                    error=str(result)
+                )
+            metrics[token] = result
         return metrics
 
+    async def iter_token_metrics(
+        self,
+        tokens: Iterable[str]
+    ) -> AsyncIterator[Tuple[str, TokenMetrics]]:
+        """Yield `(token, metrics)` as each token's fetch completes.
+        
+        At most the client's `max_concurrency` fetches are in flight; a new
+        one starts as each finishes, so long token lists never hold more
+        than that many pending tasks. Fetches still running when the
+        consumer stops early are cancelled.
+        """
+        pending_tokens = iter(tokens)
+        running: Dict[asyncio.Task, str] = {}
+        
+        def start_next() -> bool:
+            token = next(pending_tokens, None)
+            if token is None:
+                return False
+            running[asyncio.create_task(self.get_token_metrics(token))] = token
+            return True
+            
+        try:
+            while len(running) < self.jupiter.max_concurrency and start_next():
+                pass
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    token = running.pop(task)
+                    start_next()
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = TokenMetrics(
+                            price=0.0,
+                            volume_24h=0.0,
+                            liquidity=0.0,
+                            holders=0,
+                            transactions_24h=0,
+                            error=str(e)
+                        )
+                    yield token, result
+        finally:
+            for task in running:
+                task.cancel()
+
 class JupiterClient:
     """Jupiter Protocol API client."""
     
-    def __init__(self, use_mock: bool = True):
-        """Initialize Jupiter client."""
+    def __init__(
+        self,
+        use_mock: bool = True,
+        max_connections: int = 64,
+        session: Optional[aiohttp.ClientSession] = None,
+        quote_ttl: float = 2.0,
+        price_ttl: float = 30.0,
+        max_concurrency: int = 32,
+        max_retries: int = 3
+    ):
+        """Initialize Jupiter client.
+        
+        Args:
+            use_mock: Serve prices/volumes from static mock data.
+            max_connections: Pool size, if this client creates the shared session.
+            session: Session to use instead of the shared one (owned by the caller).
+            quote_ttl: Seconds an identical quote request is served from cache.
+            price_ttl: Seconds a derived price is served from cache.
+            max_concurrency: Most requests one multi-token/multi-size call keeps in flight.
+            max_retries: Retries for a request failing with a transient error.
+        """
         self.base_url = "https://quote-api.jup.ag/v6"
-        self.session = None
+        self.session = session
         self.use_mock = use_mock
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = DEFAULT_TIMEOUT
+        self._limiter = JUPITER_LIMITER  # Jupiter API budget, shared across clients
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._quote_cache = TTLCache(quote_ttl)
+        self._price_cache = TTLCache(price_ttl)
 
-    async def ensure_session(self):
-        """Initialize aiohttp session."""
-        if not self.session:
-            self.session = aiohttp.ClientSession(
-                headers={
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json'
-                }
-            )
+    async def ensure_session(self) -> aiohttp.ClientSession:
+        """Return the session, attaching the process-wide one on first use.
+        
+        Every client shares that session's keep-alive pool, so requests to
+        the Jupiter API skip the TCP/TLS handshake across instances.
+        """
+        if self.session is None or self.session.closed:
+            self.session = await get_session(self.max_connections)
+        return self.session
 
     async def close(self):
-        """Close the session."""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Detach from the session.
+        
+        The shared session outlives clients; it is closed once at shutdown
+        by `http_utils.close_session`.
+        """
+        self.session = None
 
-    def _get_token_mint(self, token: str) -> str:
-        """Get token mint address."""
-        return TOKEN_MINTS.get(token.upper(), token)
+    async def _request(self, method: str, path: str, **kwargs) -> Tuple[int, bytes]:
+        """Rate-limited Jupiter API call with retries; returns (status, body)."""
+        session = await self.ensure_session()
+        return await request_with_retry(
+            session,
+            method,
+            f"{self.base_url}{path}",
+            limiter=self._limiter,
+            max_retries=self.max_retries,
+            timeout=self.timeout,
+            **kwargs
+        )
+
+    def _get_token_info(self, token: str) -> Tuple[str, int]:
+        """Get (mint address, decimals) for a symbol in any case.
+        
+        Upper-case symbols resolve with one lookup; anything unknown is taken
+        to be a mint address with DEFAULT_DECIMALS.
+        """
+        info = TOKEN_INFO.get(token) or TOKEN_INFO.get(token.upper())
+        return info or (token, DEFAULT_DECIMALS)
 
     async def get_quote(
         self,
@@ -107,30 +311,40 @@ class JupiterClient:
         output_token: str,
         amount: Union[int, float, str],
         slippage_bps: int = 50,
-        exact_out: bool = False
+        exact_out: bool = False,
+        force_refresh: bool = False
     ) -> Optional[Dict]:
-        """Get quote from Jupiter."""
+        """Get quote from Jupiter.
+        
+        Identical requests within `quote_ttl` seconds reuse the last quote;
+        pass `force_refresh=True` to always hit the API.
+        """
         try:
-            await self.ensure_session()
-            
             params = {
-                "inputMint": self._get_token_mint(input_token),
-                "outputMint": self._get_token_mint(output_token),
+                "inputMint": self._get_token_info(input_token)[0],
+                "outputMint": self._get_token_info(output_token)[0],
                 "amount": str(amount),
                 "slippageBps": slippage_bps,
                 "swapMode": "ExactOut" if exact_out else "ExactIn"
             }
+            key = tuple(params.values())
             
-            async with self.session.get(f"{self.base_url}/quote", params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Quote error: {response.status} - {error_text}")
-                    return None
+            if not force_refresh:
+                quote = self._quote_cache.get(key)
+                if quote is not None:
+                    return quote
+                    
+            status, body = await self._request('GET', '/quote', params=params)
+            if status == 200:
+                quote = orjson.loads(body)
+                self._quote_cache.put(key, quote)
+                return quote
+            else:
+                logger.error("Quote error: %s - %s", status, body.decode(errors='replace'))
+                return None
                     
         except Exception as e:
-            logger.error(f"Error getting quote: {e}")
+            logger.error("Error getting quote: %s", e)
             return None
 
     async def get_swap_tx(
@@ -141,31 +355,28 @@ class JupiterClient:
     ) -> Optional[Dict]:
         """Get swap transaction from Jupiter."""
         try:
-            await self.ensure_session()
-            
-            payload = {
+            fields = {
                 "quoteResponse": quote_response,
-                "userPublicKey": user_public_key,
-                "wrapAndUnwrapSol": True,
-                "useSharedAccounts": True,
-                "dynamicComputeUnitLimit": True,
-                "skipUserAccountsRpcCalls": True,
-                "prioritizationFeeLamports": "auto"
+                "userPublicKey": user_public_key
             }
             
             if options:
-                payload.update(options)
+                fields.update(options)
             
-            async with self.session.post(f"{self.base_url}/swap", json=payload) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Swap error: {response.status} - {error_text}")
-                    return None
+            status, body = await self._request(
+                'POST',
+                '/swap',
+                data=_encode_payload(fields, _SWAP_DEFAULTS, _SWAP_DEFAULTS_JSON),
+                headers=_JSON_HEADERS
+            )
+            if status == 200:
+                return orjson.loads(body)
+            else:
+                logger.error("Swap error: %s - %s", status, body.decode(errors='replace'))
+                return None
                     
         except Exception as e:
-            logger.error(f"Error getting swap tx: {e}")
+            logger.error("Error getting swap tx: %s", e)
             return None
 
     async def get_swap_instructions(
@@ -176,28 +387,28 @@ class JupiterClient:
     ) -> Optional[Dict]:
         """Get swap instructions from Jupiter."""
         try:
-            await self.ensure_session()
-            
-            payload = {
+            fields = {
                 "quoteResponse": quote_response,
-                "userPublicKey": user_public_key,
-                "computeUnitPriceMicroLamports": "auto",
-                "dynamicComputeUnitLimit": True
+                "userPublicKey": user_public_key
             }
             
             if options:
-                payload.update(options)
+                fields.update(options)
             
-            async with self.session.post(f"{self.base_url}/swap-instructions", json=payload) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Instructions error: {response.status} - {error_text}")
-                    return None
+            status, body = await self._request(
+                'POST',
+                '/swap-instructions',
+                data=_encode_payload(fields, _INSTRUCTIONS_DEFAULTS, _INSTRUCTIONS_DEFAULTS_JSON),
+                headers=_JSON_HEADERS
+            )
+            if status == 200:
+                return orjson.loads(body)
+            else:
+                logger.error("Instructions error: %s - %s", status, body.decode(errors='replace'))
+                return None
                     
         except Exception as e:
-            logger.error(f"Error getting instructions: {e}")
+            logger.error("Error getting instructions: %s", e)
             return None
 
     async def execute_swap(
@@ -207,24 +418,30 @@ class JupiterClient:
         amount: Union[int, float, str],
         user_public_key: str,
         slippage_bps: int = 50,
-        exact_out: bool = False
+        exact_out: bool = False,
+        quote: Optional[Dict] = None
     ) -> Dict:
-        """Execute a swap through Jupiter."""
+        """Execute a swap through Jupiter.
+        
+        Pass a fresh `quote` for these parameters (e.g. from pricing the
+        trade) to skip the /quote round-trip. The /swap request is sent as
+        soon as the quote is in hand, and the result is assembled while it
+        is in flight.
+        """
         try:
-          
-            quote = await self.get_quote(
-                input_token=input_token,
-                output_token=output_token,
-                amount=amount,
-                slippage_bps=slippage_bps,
-                exact_out=exact_out
-            )
+            if quote is None:
+                quote = await self.get_quote(
+                    input_token=input_token,
+                    output_token=output_token,
+                    amount=amount,
+                    slippage_bps=slippage_bps,
+                    exact_out=exact_out
+                )
             
             if not quote:
                 raise Exception("Failed to get quote")
                 
-         
-            swap_tx = await self.get_swap_tx(
+            swap_task = asyncio.create_task(self.get_swap_tx(
                 quote_response=quote,
                 user_public_key=user_public_key,
                 options={
@@ -233,12 +450,9 @@ class JupiterClient:
                         "maxBps": slippage_bps
                     }
                 }
-            )
+            ))
             
-            if not swap_tx:
-                raise Exception("Failed to get swap transaction")
-                
-            return {
+            result = {
                 'success': True,
                 'input_token': input_token,
                 'output_token': output_token,
@@ -246,11 +460,18 @@ class JupiterClient:
                 'amount_out': quote.get('outAmount'),
                 'price_impact': quote.get('priceImpactPct'),
                 'slippage': slippage_bps / 10000,  
-                'transaction': swap_tx
+                'transaction': None
             }
             
+            swap_tx = await swap_task
+            if not swap_tx:
+                raise Exception("Failed to get swap transaction")
+                
+            result['transaction'] = swap_tx
+            return result
+            
         except Exception as e:
-            logger.error(f"Swap execution failed: {e}")
+            logger.error("Swap execution failed: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -263,51 +484,71 @@ class JupiterClient:
         self,
         token: str,
         quote_token: str = 'USDC',
-        amount: str = "1000000"  
+        amount: str = "1000000",
+        force_refresh: bool = False
     ) -> Optional[float]:
-        """Get token price in terms of quote token."""
+        """Get token price in terms of quote token.
+        
+        Prices are cached for `price_ttl` seconds, and concurrent requests
+        for the same price share a single quote call.
+        """
+        if self.use_mock:
+            return _MOCK_PRICES.get(token.upper(), 0.0)
+            
+        key = ('price', token, quote_token, amount)
+        if not force_refresh:
+            price = self._price_cache.get(key)
+            if price is not None:
+                return price
+                
+        price = await coalesce(
+            self._inflight,
+            key,
+            lambda: self._fetch_price(token, quote_token, amount, force_refresh)
+        )
+        if price is not None:
+            self._price_cache.put(key, price)
+        return price
+        
+    async def _fetch_price(
+        self,
+        token: str,
+        quote_token: str,
+        amount: str,
+        force_refresh: bool = False
+    ) -> Optional[float]:
+        """Quote `amount` of quote token into `token` and derive the price."""
         try:
-            if self.use_mock:
-              
-                mock_prices = {
-                    'SOL': 90.0,
-                    'BONK': 0.000012,
-                    'JUP': 1.20
-                }
-                return mock_prices.get(token.upper(), 0.0)
-
-         
             quote = await self.get_quote(
                 input_token=quote_token,
                 output_token=token,
                 amount=amount,
-                slippage_bps=50
+                slippage_bps=50,
+                force_refresh=force_refresh
             )
             
             if not quote:
-                logger.error(f"Failed to get price quote for {token}")
+                logger.error("Failed to get price quote for %s", token)
                 return None
                 
             
             try:
-                in_amount = Decimal(quote['inAmount'])
-                out_amount = Decimal(quote['outAmount'])
-                
-               
-                in_decimals = 6 if quote_token == 'USDC' else 9
-                out_decimals = 9 if token == 'SOL' else 6
+                in_decimals = self._get_token_info(quote_token)[1]
+                out_decimals = self._get_token_info(token)[1]
                 
-                price = float(in_amount / Decimal(10 ** in_decimals) / 
-                            (out_amount / Decimal(10 ** out_decimals)))
-                
-                return price
+                return unit_price(
+                    quote['inAmount'],
+                    quote['outAmount'],
+                    10 ** in_decimals,
+                    10 ** out_decimals
+                )
                 
-            except (KeyError, ValueError, decimal.InvalidOperation) as e:
-                logger.error(f"Error calculating price from quote: {e}")
+            except (KeyError, ValueError, ZeroDivisionError, decimal.InvalidOperation) as e:
+                logger.error("Error calculating price from quote: %s", e)
                 return None
                 
         except Exception as e:
-            logger.error(f"Error getting price for {token}: {e}")
+            logger.error("Error getting price for %s: %s", token, e)
             return None
             
     async def get_prices(
@@ -315,10 +556,16 @@ class JupiterClient:
         tokens: List[str],
         quote_token: str = 'USDC'
     ) -> Dict[str, Optional[float]]:
-        """Get prices for multiple tokens."""
+        """Get prices for multiple tokens, at most `max_concurrency` at a time."""
+        results = await run_bounded(
+            (self.get_price(token, quote_token) for token in tokens),
+            self.max_concurrency
+        )
         prices = {}
-        for token in tokens:
-            price = await self.get_price(token, quote_token)
+        for token, price in zip(tokens, results):
+            if isinstance(price, Exception):
+                logger.error("Error getting price for %s: %s", token, price)
+                price = None
             prices[token] = price
         return prices
 
@@ -330,12 +577,7 @@ class JupiterClient:
         """Get 24h trading volume for token."""
         # TODO: Implement real volume fetching
         if self.use_mock:
-            mock_volumes = {
-                'SOL': 150000000.0,
-                'BONK': 25000000.0,
-                'JUP': 5000000.0
-            }
-            return mock_volumes.get(token.upper(), 0.0)
+            return _MOCK_VOLUMES.get(token.upper(), 0.0)
         return 0.0
 
     async def get_token_liquidity(
@@ -346,12 +588,7 @@ class JupiterClient:
         """Get total liquidity for token."""
        
         if self.use_mock:
-            mock_liquidity = {
-                'SOL': 500000000.0,
-                'BONK': 50000000.0,
-                'JUP': 10000000.0
-            }
-            return mock_liquidity.get(token.upper(), 0.0)
+            return _MOCK_LIQUIDITY.get(token.upper(), 0.0)
         return 0.0
 
     async def get_market_depth(
@@ -370,49 +607,64 @@ class JupiterClient:
         Returns:
             Dictionary containing price and price impact for each test size
         """
-        depth_data = {}
+        # Unit scales are the same for every size; compute them once
+        in_scale = 10 ** self._get_token_info(input_token)[1]
+        out_scale = 10 ** self._get_token_info(output_token)[1]
         
-        for size in test_sizes:
-            try:
-              
-                size_in_decimals = str(int(size * 1_000_000))
-                
-                quote = await self.get_quote(
-                    input_token=input_token,
-                    output_token=output_token,
-                    amount=size_in_decimals
-                )
-                
-                if quote:
-                
-                    try:
-                        in_amount = Decimal(quote['inAmount'])
-                        out_amount = Decimal(quote['outAmount'])
-                        
-                    
-                        in_decimals = 6 if input_token == 'USDC' else 9
-                        out_decimals = 6 if output_token == 'USDC' else 9
-                        
-                        effective_price = float(
-                            (in_amount / Decimal(10 ** in_decimals)) /
-                            (out_amount / Decimal(10 ** out_decimals))
-                        )
-                        
-                        depth_data[size] = {
-                            'price': effective_price,
-                            'price_impact': float(quote.get('priceImpactPct', 0)),
-                            'in_amount': str(in_amount),
-                            'out_amount': str(out_amount)
-                        }
-                    except (decimal.InvalidOperation, KeyError) as e:
-                        logger.error(f"Error calculating metrics for size {size}: {e}")
-                        continue
-                        
-            except Exception as e:
-                logger.error(f"Error getting depth for size {size}: {e}")
-                continue
+        # Every size is an independent quote, so request them concurrently
+        results = await run_bounded(
+            (
+                self._depth_at(input_token, output_token, size, in_scale, out_scale)
+                for size in test_sizes
+            ),
+            self.max_concurrency
+        )
+        
+        depth_data = {}
+        for size, result in zip(test_sizes, results):
+            if isinstance(result, Exception):
+                logger.error("Error getting depth for size %s: %s", size, result)
+            elif result is not None:
+                depth_data[size] = result
                 
         return depth_data
+        
+    async def _depth_at(
+        self,
+        input_token: str,
+        output_token: str,
+        size: Union[int, float],
+        in_scale: int,
+        out_scale: int
+    ) -> Optional[Dict]:
+        """Quote one `get_market_depth` test size; None if it can't be priced.
+        
+        `in_scale` / `out_scale` convert raw input/output amounts to token units.
+        """
+        size_in_decimals = str(int(size * 1_000_000))
+        
+        quote = await self.get_quote(
+            input_token=input_token,
+            output_token=output_token,
+            amount=size_in_decimals
+        )
+        
+        if not quote:
+            return None
+            
+        try:
+            in_amount = quote['inAmount']
+            out_amount = quote['outAmount']
+            
+            return {
+                'price': unit_price(in_amount, out_amount, in_scale, out_scale),
+                'price_impact': float(quote.get('priceImpactPct', 0)),
+                'in_amount': str(in_amount),
+                'out_amount': str(out_amount)
+            }
+        except (KeyError, ValueError, ZeroDivisionError, decimal.InvalidOperation) as e:
+            logger.error("Error calculating metrics for size %s: %s", size, e)
+            return None
 
     async def get_token_metrics(
         self,
@@ -451,7 +703,7 @@ class JupiterClient:
             )
             
         except Exception as e:
-            logger.error(f"Error getting token metrics: {e}")
+            logger.error("Error getting token metrics: %s", e)
             return TokenMetrics(
                 price=0.0,
                 volume_24h=0.0,
@@ -0,0 +1,189 @@
+# src/http_utils.py
+"""HTTP plumbing shared by the Jupiter and LLM clients.
+
+Every client draws from one process-wide aiohttp session, so keep-alive
+connections (and their TCP/TLS handshakes) are reused across clients and
+instances. The session is created on first use and closed once, at
+application shutdown, with `close_session`. Calls to each upstream host
+go through that host's shared rate limiter.
+"""
+import asyncio
+import logging
+import random
+import time
+import aiohttp
+import orjson
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limited or a transient gateway failure
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Jupiter answers in well under a second; fail fast on a stalled connect or read.
+# Slower upstreams (the LLM) pass their own per-request timeout.
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=2, sock_read=5)
+
+_SESSION: Optional[aiohttp.ClientSession] = None
+_SESSION_LOCK = asyncio.Lock()
+
+def _dumps(obj) -> str:
+    """orjson encoder for `json=` request bodies (aiohttp expects str)."""
+    return orjson.dumps(obj).decode()
+
+async def get_session(limit: int = 64) -> aiohttp.ClientSession:
+    """Return the shared session, creating it on first use.
+    
+    `limit` caps the pool's total connections and only applies to the call
+    that creates the session. The pool is tuned for a few hosts hit
+    constantly: long-lived DNS and keep-alive, and no cookie jar (none of
+    the APIs set cookies).
+    """
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        async with _SESSION_LOCK:
+            if _SESSION is None or _SESSION.closed:
+                _SESSION = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=limit,
+                        limit_per_host=min(limit, 32),
+                        use_dns_cache=True,
+                        ttl_dns_cache=600,
+                        keepalive_timeout=75,
+                        enable_cleanup_closed=True
+                    ),
+                    timeout=DEFAULT_TIMEOUT,
+                    cookie_jar=aiohttp.DummyCookieJar(),
+                    headers={'Accept': 'application/json'},
+                    json_serialize=_dumps
+                )
+    return _SESSION
+
+async def close_session():
+    """Close the shared session; call once at application shutdown."""
+    global _SESSION
+    if _SESSION is not None:
+        await _SESSION.close()
+        _SESSION = None
+
+class TTLCache:
+    """Small LRU cache whose entries expire `ttl` seconds after being stored."""
+    
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expiry, value)
+        
+    def get(self, key: Hashable) -> Any:
+        """Cached value for `key`, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expiry, value = entry
+        if time.monotonic() >= expiry:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+        
+    def put(self, key: Hashable, value: Any):
+        """Store `value`, evicting the least recently used entry when full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            
+    def pop(self, key: Hashable) -> Any:
+        """Remove and return the live value for `key`, or None."""
+        value = self.get(key)
+        self._entries.pop(key, None)
+        return value
+
+class AsyncRateLimiter:
+    """Token bucket allowing `max_rate` calls per `time_period` seconds.
+    
+    Up to `max_rate` calls pass immediately after an idle spell; beyond that
+    callers wait, in arrival order, for the bucket to refill. Use as
+    `async with limiter:` around each request.
+    """
+    
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        
+    async def acquire(self):
+        """Wait until a call is allowed, then consume one token."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.max_rate,
+                    self._tokens + (now - self._updated) * self.max_rate / self.time_period
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+                
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+        
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+# Per-host budgets, shared by every client of that host
+JUPITER_LIMITER = AsyncRateLimiter(max_rate=10, time_period=1.0)
+LLM_LIMITER = AsyncRateLimiter(max_rate=2, time_period=1.0)
+
+async def request_with_retry(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: str,
+    *,
+    limiter: Optional[AsyncRateLimiter] = None,
+    max_retries: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    jitter: float = 0.25,
+    **kwargs
+) -> Tuple[int, bytes]:
+    """Send a request, retrying transient failures, and return (status, body).
+    
+    Connection errors, timeouts and RETRY_STATUSES responses are retried up
+    to `max_retries` times, waiting `min(max_delay, base_delay * 2**attempt)`
+    plus up to `jitter` seconds, or the server's Retry-After on a 429. Each
+    attempt first acquires `limiter`. The last failure is returned (for a
+    status) or raised (for an exception) once retries run out.
+    """
+    for attempt in range(max_retries + 1):
+        retry_after = None
+        try:
+            if limiter is not None:
+                await limiter.acquire()
+            async with session.request(method, url, **kwargs) as response:
+                status = response.status
+                body = await response.read()
+                if status not in RETRY_STATUSES or attempt == max_retries:
+                    return status, body
+                if status == 429:
+                    retry_after = response.headers.get('Retry-After')
+            reason = f"status {status}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt == max_retries:
+                raise
+            reason = repr(e)
+            
+        delay = min(max_delay, base_delay * 2 ** attempt) + random.uniform(0, jitter)
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                pass  # HTTP-date form; keep the backoff delay
+        logger.warning("%s %s failed (%s), retry %d/%d in %.2fs", method, url, reason, attempt + 1, max_retries, delay)
+        await asyncio.sleep(delay)
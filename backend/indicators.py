@@ -0,0 +1,84 @@
+# src/indicators.py
+"""Technical indicators over a whole price history, one row per bar."""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from _njit import NUMBA_AVAILABLE
+
+# pandas window engine for the full-history indicators; numba JIT-compiles the
+# window loops once per process when it is installed
+WINDOW_ENGINE = 'numba' if NUMBA_AVAILABLE else 'cython'
+
+def _sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing `window`-bar mean aligned with `values` (NaN until the window fills).
+
+    Reduces a strided view of every window at once - no copy, no pandas.
+    """
+    out = np.full(values.shape[0], np.nan)
+    if 0 < window <= values.shape[0]:
+        out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+def _rstd(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing `window`-bar sample std aligned with `values` (NaN until the window fills).
+
+    Deviations are taken from each window's first value (std is shift-invariant),
+    so a flat window comes out exactly 0.0 rather than rounding noise.
+    """
+    out = np.full(values.shape[0], np.nan)
+    if 1 < window <= values.shape[0]:
+        windows = sliding_window_view(values, window)
+        out[window - 1:] = (windows - windows[:, :1]).std(axis=1, ddof=1)
+    return out
+
+def indicator_series(
+    prices: pd.Series,
+    rsi_period: int = 14,
+    fast_period: int = 12,
+    slow_period: int = 26,
+    signal_period: int = 9,
+    bb_window: int = 20,
+    num_std: float = 2.0,
+    momentum_period: int = 14
+) -> pd.DataFrame:
+    """Full-history form of `MarketAnalyzer.calculate_technical_indicators`.
+    
+    Row t holds the indicators as they stood at bar t, so a backtest can
+    compute them once over the whole series instead of once per bar.
+    Bars without enough history get the same neutral values.
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    # numba's window kernels fail to type a single-row input (a sub-hour backtest)
+    engine = WINDOW_ENGINE if len(prices) >= 2 else 'cython'
+    
+    # Mean gain/loss over the window; their ratio equals the ratio of sums
+    delta = np.diff(values, prepend=np.nan)
+    gain = _sma(np.maximum(delta, 0.0), rsi_period)
+    loss = _sma(-np.minimum(delta, 0.0), rsi_period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - 100 / (1 + gain / loss)
+    rsi[(loss == 0) & (gain > 0)] = 100.0
+    rsi[np.isnan(rsi)] = 50.0
+    
+    macd = (
+        prices.ewm(span=fast_period, adjust=False).mean(engine=engine) -
+        prices.ewm(span=slow_period, adjust=False).mean(engine=engine)
+    )
+    histogram = macd - macd.ewm(span=signal_period, adjust=False).mean(engine=engine)
+    
+    rolling_mean = _sma(values, bb_window)
+    rolling_std = _rstd(values, bb_window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bollinger = (values - (rolling_mean - num_std * rolling_std)) / (2 * num_std * rolling_std)
+    bollinger[~(rolling_std > 0) | np.isnan(bollinger)] = 0.5
+    
+    returns = prices.pct_change()
+    
+    return pd.DataFrame({
+        'rsi': rsi,
+        'macd': histogram,
+        'bollinger_position': bollinger,
+        'momentum': prices.pct_change(momentum_period).fillna(0.0),
+        'volatility': returns.expanding(min_periods=2).std(engine=engine).fillna(0.0)
+    }, index=prices.index)
@@ -1,14 +1,24 @@
 # src/llm_client_simple.py  # Renamed file to indicate simplicity
 
+import asyncio
+import re
 import aiohttp
 import logging
-import json  # Still need json for payload
-from typing import Dict, List, Any  # Keep necessary types
+import orjson  # Fast JSON for payloads and responses
+from typing import Dict, List, Any, Optional, Set  # Keep necessary types
 
-# Basic logger setup - for errors, can be further simplified if needed
-logging.basicConfig(level=logging.ERROR) # Simpler logging level
+import http_utils  # Process-wide shared aiohttp session
+from semantic_cache import SemanticCache
+
+# Module logger only - the application configures handlers (agents.setup_logging)
 logger = logging.getLogger(__name__)
 
+# The whole (unstreamed) generation arrives at once, so only bound connect and total;
+# the shared session's Jupiter-sized default would cut off long or batched answers
+_LLM_TIMEOUT = aiohttp.ClientTimeout(total=180, connect=2)
+
+_BATCH_HEADER = re.compile(r"^###\s*(\d+)\s*$", re.MULTILINE) # Answer headers in a batched reply
+
 class SimpleChatClient: # Renamed class for simplicity
     """
     A basic client for interacting with a chat-based LLM API (like GaiaNet).
@@ -17,49 +27,80 @@ class SimpleChatClient: # Renamed class for simplicity
 
     API_URL = "https://0xe7d21e1bd35163c0bcdc6d5ea8c23f3c277f2d17.us.gaianet.network/v1/chat/completions" # Direct URL, simpler
 
-    def __init__(self):
-        """Initializes the SimpleChatClient."""
-        self._session = None # Use underscore to indicate "internal"
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        cache: Optional[SemanticCache] = None,
+        batch_size: int = 8,
+        batch_wait: float = 0.05,
+        max_concurrency: int = 4
+    ):
+        """Initializes the SimpleChatClient.
+
+        Pass `session` to use a caller-owned session instead of the shared one,
+        and `cache` to share a response cache between clients. `batch_size`,
+        `batch_wait` (seconds) and `max_concurrency` tune `get_batched_response`.
+        """
+        self._session = session # Use underscore to indicate "internal"
+        self._cache = cache if cache is not None else SemanticCache() # Recent answers to equivalent prompts
+        self._limiter = http_utils.LLM_LIMITER # GaiaNet request budget, shared across clients
         self.default_system_prompt = ( # Renamed to prompt for simplicity
             "Act as a crypto trading expert. Provide concise, actionable advice based on market analysis."
         )
+        self._system_message = {"role": "system", "content": self.default_system_prompt} # Built once, shared by requests
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self._batch_queue: Optional[asyncio.Queue] = None # (prompt, max_tokens, temperature, future)
+        self._batch_worker: Optional[asyncio.Task] = None
+        self._batch_tasks: Set[asyncio.Task] = set() # Batches in flight, held until done
+        self._batch_slots = asyncio.Semaphore(max_concurrency) # Batches in flight at once
 
     async def _get_session(self): # Simplified session management, internal method
-        """Manages the aiohttp session."""
-        if self._session is None:
-            self._session = aiohttp.ClientSession(
-                headers={"Content-Type": "application/json"} # Minimal headers
-            )
+        """Returns the session, attaching the shared one on first use."""
+        if self._session is None or self._session.closed:
+            self._session = await http_utils.get_session()
         return self._session
 
     async def close_session(self): # Method to close session if needed
-        """Closes the aiohttp session."""
-        if self._session:
-            await self._session.close()
-            self._session = None
+        """Detaches from the session and stops the batching worker, answering
+        still-queued prompts with None; the shared session is closed at shutdown."""
+        if self._batch_worker is not None:
+            self._batch_worker.cancel()
+            self._batch_worker = None
+        if self._batch_queue is not None:
+            while not self._batch_queue.empty():
+                *_, future = self._batch_queue.get_nowait()
+                if not future.done():
+                    future.set_result(None)
+        self._session = None
 
     async def get_response( # Renamed from chat_completion to get_response, more generic
         self,
         messages: List[Dict[str, str]],
         max_tokens: int = 500, # Reduced default max_tokens for simplicity
         temperature: float = 0.7,
+        no_cache: bool = False,
     ) -> Optional[Dict[str, Any]]: # Optional return type for error handling
         """
         Sends a request to the LLM API and returns the response.
-        Simplified error handling and request process.
+        Simplified error handling and request process. A system message, if
+        given, must come first; otherwise the default one is prepended.
+
+        A recent response to an equivalent request is returned from the
+        semantic cache instead; pass `no_cache=True` to always ask the API.
         """
         session = await self._get_session() # Get or create session
         api_endpoint = self.API_URL # Use class constant directly
 
-        # Ensure system message - simpler check
-        has_system_message = False
-        for msg in messages:
-            if msg.get('role') == 'system':
-                has_system_message = True
-                break
-        if not has_system_message:
-            messages.insert(0, {"role": "system", "content": self.default_system_prompt})
+        # Ensure system message - callers put theirs first, so only messages[0] is checked.
+        # Prepending builds a new list; the caller's list is left untouched.
+        if not messages or messages[0].get('role') != 'system':
+            messages = [self._system_message, *messages]
 
+        if not no_cache:
+            cached = await self._cache.get(messages, temperature, max_tokens)
+            if cached is not None:
+                return cached
 
         payload = {
             "messages": messages,
@@ -69,21 +110,120 @@ class SimpleChatClient: # Renamed class for simplicity
         }
 
         try:
-            async with session.post(api_endpoint, json=payload) as response:
+            async with self._limiter, session.post(api_endpoint, json=payload, timeout=_LLM_TIMEOUT) as response:
                 if response.status == 200:
-                    return await response.json() # Return JSON directly
+                    result = orjson.loads(await response.read()) # Return JSON directly
+                    if not no_cache:
+                        await self._cache.put(messages, temperature, max_tokens, result)
+                    return result
                 else:
                     error_text = await response.text()
-                    logger.error(f"LLM API Error {response.status}: {error_text}") # Simpler error log
+                    logger.error("LLM API Error %s: %s", response.status, error_text) # Simpler error log
                     return None # Indicate failure with None
 
         except aiohttp.ClientError as e:
-            logger.error(f"Network error during API request: {e}") # Simpler network error log
+            logger.error("Network error during API request: %s", e) # Simpler network error log
             return None # Indicate failure with None
         except Exception as e:
             logger.exception("Unexpected error during LLM API call:") # More general exception logging
             return None # Indicate failure with None
 
+    async def get_batched_response(
+        self,
+        prompt: str,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+    ) -> Optional[str]:
+        """
+        Answers one user prompt, sharing an API call with other prompts that
+        arrive within `batch_wait` seconds (up to `batch_size` of them).
+        Returns the answer text, or None on failure.
+        """
+        if self._batch_queue is None:
+            self._batch_queue = asyncio.Queue()
+        if self._batch_worker is None or self._batch_worker.done():
+            self._batch_worker = asyncio.create_task(self._run_batches())
+        future = asyncio.get_running_loop().create_future()
+        await self._batch_queue.put((prompt, max_tokens, temperature, future))
+        return await future
+
+    async def _run_batches(self):
+        """Drains queued prompts into batches and sends each one."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._batch_queue.get()]
+            unsent = batch # Taken off the queue but not yet handed to a batch task
+            try:
+                deadline = loop.time() + self.batch_wait
+                while len(batch) < self.batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._batch_queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                # Prompts only share a call when they share a temperature
+                groups: Dict[float, List[tuple]] = {}
+                for item in batch:
+                    groups.setdefault(item[2], []).append(item)
+                for items in groups.values():
+                    await self._batch_slots.acquire()
+                    task = asyncio.create_task(self._send_batch(items))
+                    self._batch_tasks.add(task)
+                    task.add_done_callback(self._batch_tasks.discard)
+                    task.add_done_callback(lambda _: self._batch_slots.release())
+                    unsent = [item for item in unsent if item not in items]
+            except asyncio.CancelledError:
+                # Closed: prompts this worker was still holding get no answer
+                for *_, future in unsent:
+                    if not future.done():
+                        future.set_result(None)
+                raise
+
+    async def _send_batch(self, items: List[tuple]):
+        """Sends a batch as one numbered request and resolves each future."""
+        answers: Dict[int, str] = {}
+        try:
+            if len(items) > 1:
+                numbered = "\n\n".join(f"### {i}\n{prompt}" for i, (prompt, *_) in enumerate(items, 1))
+                response = await self.get_response(
+                    [{"role": "user", "content": (
+                        "Answer each numbered request below separately. Begin each answer with "
+                        "its header line ('### <number>') and nothing else on that line.\n\n" + numbered
+                    )}],
+                    max_tokens=sum(max_tokens for _, max_tokens, _, _ in items),
+                    temperature=items[0][2]
+                )
+                if response and response.get('choices'):
+                    parts = _BATCH_HEADER.split(response['choices'][0]['message']['content'])
+                    # split() yields [preamble, number, answer, number, answer, ...]
+                    answers = {int(n): text.strip() for n, text in zip(parts[1::2], parts[2::2])}
+
+            # Unbatched, or the reply didn't keep these answers' headers: ask for them concurrently
+            missing = [i for i in range(1, len(items) + 1) if i not in answers]
+            responses = await asyncio.gather(*(
+                self.get_response(
+                    [{"role": "user", "content": items[i - 1][0]}],
+                    max_tokens=items[i - 1][1],
+                    temperature=items[i - 1][2]
+                )
+                for i in missing
+            ))
+            for i, response in zip(missing, responses):
+                if response and response.get('choices'):
+                    answers[i] = response['choices'][0]['message']['content']
+
+            for i, (*_, future) in enumerate(items, 1):
+                if not future.done():
+                    future.set_result(answers.get(i))
+        except Exception as e:
+            logger.exception("Unexpected error during batched LLM call:")
+            for *_, future in items:
+                if not future.done():
+                    future.set_exception(e)
+
 
 # Example usage (optional, for demonstration in this file)
 async def main():
@@ -103,8 +243,9 @@ async def main():
             print("Failed to get a response from the LLM API.")
 
     finally:
-        await client.close_session() # Ensure session is closed
+        await client.close_session()
+        await http_utils.close_session() # Ensure the shared session is closed
 
 if __name__ == "__main__":
-    import asyncio
+    logging.basicConfig(level=logging.ERROR) # Standalone demo: errors to stderr
     asyncio.run(main())
\ No newline at end of file
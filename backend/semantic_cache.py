@@ -0,0 +1,113 @@
+# src/semantic_cache.py
+"""Short-lived cache of LLM responses, looked up by meaning.
+
+Requests match when everything before the final message is identical, the
+temperature bucket and token budget agree, and the final message is either
+the same text (ignoring case and spacing) or, with sentence-transformers
+installed, an embedding whose cosine similarity clears `threshold` and
+whose numbers, signs included, are exactly the same (embeddings barely
+tell prices or balances apart). sentence-transformers is optional:
+without it only the exact-text match applies.
+"""
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+try:
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    EMBEDDINGS_AVAILABLE = False
+
+_NUMBERS = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")  # Signed, so -7.5% and 7.5% differ
+
+class SemanticCache:
+    """TTL cache of chat responses keyed on the final user message."""
+
+    def __init__(
+        self,
+        ttl: float = 600.0,
+        threshold: float = 0.92,
+        max_entries: int = 512,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    ):
+        self.ttl = ttl  # Trading advice goes stale quickly
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.model_name = model_name
+        self._model = None  # Loaded on first embed
+        # (scope, normalized text) -> (expiry, unit embedding or None, response)
+        self._entries: "OrderedDict[Tuple[Hashable, str], Tuple[float, Optional[np.ndarray], Any]]" = OrderedDict()
+
+    @staticmethod
+    def _key(messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> Tuple[Hashable, str]:
+        """(scope, normalized final message) for a request."""
+        scope = (orjson.dumps(messages[:-1]), round(temperature, 1), max_tokens)
+        text = " ".join(str(messages[-1].get('content', '')).lower().split())
+        return scope, text
+
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Unit-length embedding of `text`, or None without sentence-transformers."""
+        if not EMBEDDINGS_AVAILABLE:
+            return None
+        if self._model is None:
+            self._model = await asyncio.to_thread(SentenceTransformer, self.model_name)
+        vector = await asyncio.to_thread(self._model.encode, text, normalize_embeddings=True)
+        return np.asarray(vector, dtype=np.float32)
+
+    def _evict_expired(self, now: float):
+        for key in [k for k, (expiry, _, _) in self._entries.items() if expiry <= now]:
+            del self._entries[key]
+
+    async def get(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int
+    ) -> Optional[Any]:
+        """Cached response for an equivalent request, or None."""
+        if not messages:
+            return None
+        scope, text = self._key(messages, temperature, max_tokens)
+        self._evict_expired(time.monotonic())
+
+        entry = self._entries.get((scope, text))
+        if entry is not None:
+            return entry[2]
+
+        numbers = _NUMBERS.findall(text)
+        candidates = [
+            (vector, response)
+            for (s, t), (_, vector, response) in self._entries.items()
+            if s == scope and vector is not None and _NUMBERS.findall(t) == numbers
+        ]
+        if not candidates:
+            return None
+        query = await self._embed(text)
+        if query is None:
+            return None
+        similarity = np.stack([vector for vector, _ in candidates]) @ query
+        best = int(np.argmax(similarity))
+        return candidates[best][1] if similarity[best] >= self.threshold else None
+
+    async def put(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response: Any
+    ):
+        """Store `response`, evicting the oldest entry when full."""
+        if not messages:
+            return
+        scope, text = self._key(messages, temperature, max_tokens)
+        vector = await self._embed(text)
+        self._entries[(scope, text)] = (time.monotonic() + self.ttl, vector, response)
+        self._entries.move_to_end((scope, text))
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -2,70 +2,152 @@
 
 import os
 import logging
+import threading
 from typing import Dict, Optional, List
 from dataclasses import dataclass
 import aiohttp
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from executors.jupiter_client import JupiterClient # Keep Jupiter client for data
+from datetime import datetime
+from _njit import NUMBA_AVAILABLE, scanner_indicators
+from executors.jupiter_client import JupiterClient, coalesce # Keep Jupiter client for data
+from http_utils import TTLCache
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Recent price history is stored as float32: its ~7 significant digits are far
+# finer than quote noise for SMA/RSI/volatility over a day of hourly prices, and
+# it halves the bytes the indicator kernel streams. Kernels accumulate in float64,
+# and everything handed back to callers is a Python float.
+PRICE_DTYPE = np.float32
+
+PRICE_CHANGE_BARS = 24 # Hourly prices spanned by the 24h price change
+
+def _warm_kernels():
+    """Compile (or load from numba's on-disk cache) the scanner kernel for the
+    dtype the scanner passes it, so the first scan doesn't pay for the JIT."""
+    scanner_indicators(np.zeros(32, dtype=PRICE_DTYPE))
+
+if NUMBA_AVAILABLE:
+    threading.Thread(target=_warm_kernels, name="njit-warmup", daemon=True).start()
+
+@dataclass(slots=True)
 class SimpleCryptoMetrics: # Renamed and simplified metrics
     price: float = 0.0
     volume: float = 0.0
     liquidity: float = 0.0
 
+    def to_dict(self) -> Dict:
+        """Plain dict of the three fields for scan results."""
+        return {'price': self.price, 'volume': self.volume, 'liquidity': self.liquidity}
+
+@dataclass(slots=True)
+class TokenMetrics:
+    """Fully-populated token metrics; failures are reported in `error`."""
+    price: float = 0.0
+    volume: float = 0.0
+    liquidity: float = 0.0
+    holders: int = 0
+    transactions: int = 0
+    price_change_24h: float = 0.0
+    error: Optional[str] = None
+
+    def to_llm_dict(self) -> Dict:
+        """Plain dict for LLM prompt payloads."""
+        return {
+            'price': self.price,
+            'volume': self.volume,
+            'liquidity': self.liquidity,
+            'holders': self.holders,
+            'transactions': self.transactions,
+            'price_change_24h': self.price_change_24h,
+            'error': self.error
+        }
+
+@dataclass(slots=True, frozen=True)
+class PriceHistory:
+    """Recent prices and their timestamps as parallel arrays, oldest first."""
+    prices: np.ndarray # PRICE_DTYPE
+    timestamps: np.ndarray # datetime64[us]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Timestamp-indexed DataFrame with a `price` column (shares `prices`, no copy)."""
+        index = pd.DatetimeIndex(self.timestamps, name='timestamp')
+        return pd.DataFrame({'price': self.prices}, index=index, copy=False)
+
 class BasicMarketScanner: # Renamed MarketAnalyzer to BasicMarketScanner
     """Simplified market scanner for crypto trading."""
 
-    def __init__(self):
+    def __init__(self, analysis_ttl: float = 5.0):
         self.data_fetcher = SimpleDataFetcher() # Renamed CryptoDataTools to SimpleDataFetcher
+        self._analysis_cache = TTLCache(analysis_ttl, max_entries=512) # token -> recent successful analysis
+        self._inflight = {} # token -> in-flight scan task
+
+    async def fetch_token_analysis(self, token: str, bypass_cache: bool = False) -> Dict: # Renamed get_token_metrics to fetch_token_analysis
+        """Fetch basic token metrics and analysis.
+
+        A successful analysis is reused for `analysis_ttl` seconds and
+        concurrent scans of the same token share one fetch; pass
+        `bypass_cache=True` to force a fresh scan.
+        """
+        if not bypass_cache:
+            analysis = self._analysis_cache.get(token)
+            if analysis is not None:
+                return analysis
+
+        analysis = await coalesce(self._inflight, token, lambda: self._scan_token(token))
+        if 'error' not in analysis:
+            self._analysis_cache.put(token, analysis)
+        return analysis
 
-    async def fetch_token_analysis(self, token: str) -> Dict: # Renamed get_token_metrics to fetch_token_analysis
-        """Fetch basic token metrics and analysis."""
+    async def _scan_token(self, token: str) -> Dict:
+        """Fetch metrics and price history for `token` and analyze them."""
+        timestamp = datetime.now().isoformat() # When the scan started; shared by both outcomes
         try:
             # Get basic metrics
             metrics = await self.data_fetcher.fetch_basic_metrics(token) # Renamed get_token_metrics to fetch_basic_metrics
 
             # Get historical prices (simplified to last 24 hours)
-            history_df = await self.data_fetcher.get_recent_prices(token) # Renamed get_historical_prices to get_recent_prices
+            history = await self.data_fetcher.get_recent_prices(token) # Renamed get_historical_prices to get_recent_prices
 
             # Perform simplified technical analysis
-            analysis = self._analyze_simple_market_data(history_df, metrics) # Renamed analyze_market_data and made it private
+            analysis = self._analyze_simple_market_data(history, metrics) # Renamed analyze_market_data and made it private
 
             return {
-                'metrics': metrics.__dict__,
+                'metrics': metrics.to_dict(),
                 'analysis': analysis,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             }
         except Exception as e:
             logger.error(f"Error scanning token {token}: {e}")
             return {
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             }
 
     def _analyze_simple_market_data( # Renamed and made private
         self,
-        history_df: pd.DataFrame, # Renamed history to history_df for clarity
+        history: PriceHistory, # Price array, no DataFrame on the hot path
         metrics: SimpleCryptoMetrics # Using the simplified metrics class
     ) -> Dict:
         """Simplified technical analysis on market data."""
         analysis = {}
 
-        if not history_df.empty:
+        if history.prices.size:
+            # Every indicator from one compiled pass over the price column
+            sma_20, current_price, price_change_24h, rsi, volatility = scanner_indicators(
+                history.prices, change_lag=PRICE_CHANGE_BARS
+            )
+
             analysis['price_indicators'] = { # Renamed price_trends to price_indicators
-                'sma_20': float(history_df['price'].rolling(20).mean().iloc[-1]), # Keep SMA
-                'current_price': float(history_df['price'].iloc[-1]),
-                'price_change_24h': self._calculate_simple_price_change(history_df) # Renamed and made private
+                'sma_20': float(sma_20), # Keep SMA
+                'current_price': float(current_price),
+                'price_change_24h': float(price_change_24h)
             }
 
             analysis['momentum_indicators'] = { # Renamed momentum to momentum_indicators
-                'rsi': self._calculate_simple_rsi(history_df['price']), # Renamed and made private, simplified RSI
-                'volatility': self._calculate_simple_volatility(history_df['price']) # Renamed and made private, simplified volatility
+                'rsi': float(rsi), # Simplified RSI
+                'volatility': float(volatility) # Simplified volatility
             }
 
         analysis['market_indicators'] = { # Renamed market_health to market_indicators
@@ -74,50 +156,25 @@ class BasicMarketScanner: # Renamed MarketAnalyzer to BasicMarketScanner
 
         return analysis
 
-    def _calculate_simple_rsi(self, prices: pd.Series, period: int = 14) -> float: # Renamed and made private, simplified RSI
-        """Calculate simplified Relative Strength Index."""
-        try:
-            delta = prices.diff()
-            up_days = delta.where(delta > 0, 0)
-            down_days = -delta.where(delta < 0, 0)
-            avg_gain = up_days.rolling(window=period, min_periods=period).mean()
-            avg_loss = down_days.rolling(window=period, min_periods=period).mean()
-            if avg_loss.iloc[-1] == 0: # Handle cases where avg_loss is zero to avoid division by zero
-                return 100.0
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            return float(rsi.iloc[-1])
-        except Exception:
-            return 50.0
-
-    def _calculate_simple_volatility(self, prices: pd.Series, window: int = 20) -> float: # Renamed and made private, simplified volatility
-        """Calculate simplified price volatility (standard deviation)."""
-        try:
-            return float(prices.rolling(window=window).std().iloc[-1]) # Simplified to rolling std dev
-        except Exception:
-            return 0.0
-
-    def _calculate_simple_price_change(self, history_df: pd.DataFrame) -> float: # Renamed and made private, simplified price change
-        """Calculate simplified 24-hour price change percentage."""
-        try:
-            if len(history_df) >= 24:
-                current_price = history_df['price'].iloc[-1]
-                past_price = history_df['price'].iloc[-24]
-                return ((current_price - past_price) / past_price) * 100
-            return 0.0
-        except Exception:
-            return 0.0
-
 
 class SimpleDataFetcher: # Renamed CryptoDataTools to SimpleDataFetcher
     """Simplified data fetching tools for crypto."""
-    def __init__(self, rpc_url: Optional[str] = None, config: Optional[Dict] = None):
-        """Initialize SimpleDataFetcher."""
+    def __init__(
+        self,
+        rpc_url: Optional[str] = None,
+        config: Optional[Dict] = None,
+        jupiter_client: Optional[JupiterClient] = None
+    ):
+        """Initialize SimpleDataFetcher.
+
+        Pass an existing `jupiter_client` to share its connection pool.
+        """
         self.config = config or {}
         self.rpc_url = rpc_url or os.getenv("RPC_URL", "https://api.mainnet-beta.solana.com")
 
         # Initialize Jupiter client - keep it for price data
-        self.jupiter_client = JupiterClient() # Renamed to jupiter_client
+        self.jupiter_client = jupiter_client or JupiterClient() # Renamed to jupiter_client
+        self._inflight = {} # token -> in-flight get_token_metrics task
 
     async def __aenter__(self):
         await self.jupiter_client.ensure_session() # Renamed to jupiter_client
@@ -146,6 +203,26 @@ class SimpleDataFetcher: # Renamed CryptoDataTools to SimpleDataFetcher
             logger.error(f"Error fetching basic metrics for {token}: {e}")
             raise
 
+    async def get_token_metrics(self, token: str) -> TokenMetrics:
+        """Fetch token metrics, never raising: errors are returned in `TokenMetrics.error`.
+
+        Concurrent requests for the same token share a single fetch.
+        """
+        return await coalesce(self._inflight, token, lambda: self._fetch_token_metrics(token))
+
+    async def _fetch_token_metrics(self, token: str) -> TokenMetrics:
+        """Build TokenMetrics from the basic price/volume/liquidity fetch."""
+        try:
+            metrics = await self.fetch_basic_metrics(token)
+        except Exception as e:
+            return TokenMetrics(error=str(e))
+
+        return TokenMetrics(
+            price=metrics.price,
+            volume=metrics.volume,
+            liquidity=metrics.liquidity,
+        )
+
     def _calculate_simple_liquidity(self, depth_data: Dict) -> float: # Renamed and made private, simplified liquidity
         """Calculate simplified effective liquidity (using top level depth)."""
         if not depth_data:
@@ -158,30 +235,31 @@ class SimpleDataFetcher: # Renamed CryptoDataTools to SimpleDataFetcher
         self,
         token: str,
         hours_limit: int = 24 # Simplified to hours_limit, default 24 hours
-    ) -> pd.DataFrame:
-        """Get recent price data (last 24 hours) using Jupiter quotes."""
-        prices = []
-        timestamps = []
-
-        end_time = datetime.now()
-        time_step = timedelta(hours=1) # Hourly data points
-
-        for i in range(hours_limit): # Loop for hours_limit
-            timestamp = end_time - (i * time_step)
-            try:
-                price = await self.jupiter_client.get_price(token) # Renamed to jupiter_client
-                if price:
-                    prices.append(float(price))
-                    timestamps.append(timestamp)
-            except Exception as e:
-                logger.error(f"Error getting recent price for {timestamp}: {e}")
-                continue
-
-        df = pd.DataFrame({
-            'price': prices,
-            'timestamp': timestamps
-        })
-        df.set_index('timestamp', inplace=True)
-        return df
+    ) -> PriceHistory:
+        """Get recent price data (last 24 hours) using Jupiter quotes.
+
+        Jupiter only quotes the current price, so that one quote fills every
+        hourly slot (oldest first); re-quoting it per hour would return the
+        same value at the cost of a round-trip each.
+        """
+        end_time = np.datetime64(datetime.now(), 'us')
+        timestamps = end_time - np.arange(hours_limit - 1, -1, -1) * np.timedelta64(1, 'h')
+
+        try:
+            price = await self.jupiter_client.get_price(token) # Renamed to jupiter_client
+        except Exception as e:
+            logger.error(f"Error getting recent price for {token}: {e}")
+            price = None
+        if not price:
+            return PriceHistory(prices=np.empty(0, dtype=PRICE_DTYPE), timestamps=timestamps[:0])
+
+        return PriceHistory(prices=np.full(hours_limit, price, dtype=PRICE_DTYPE), timestamps=timestamps)
+
+    async def get_historical_prices(self, token: str, hours_limit: int = 24) -> pd.DataFrame:
+        """`get_recent_prices` as a timestamp-indexed DataFrame with a `price` column,
+        the form MarketAnalyzer and the backtester work with."""
+        return (await self.get_recent_prices(token, hours_limit)).to_frame()
 
 
+# The agents, backtester and package exports know the fetcher by its original name
+CryptoDataTools = SimpleDataFetcher
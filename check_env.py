@@ -5,54 +5,63 @@ import ssl
 import logging
 import aiohttp
 import asyncio
+from typing import Optional
 from dotenv import load_dotenv
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def check_jupiter_connection():
-    """Test connection to Jupiter API."""
+# Loading the system CA bundle is slow; build the context once and share it
+_SSL_CTX = ssl.create_default_context()
+
+def _make_session() -> aiohttp.ClientSession:
+    """Session for the API checks; one is shared by every check in `main`."""
+    connector = aiohttp.TCPConnector(ssl=_SSL_CTX, limit=32, ttl_dns_cache=300)
+    return aiohttp.ClientSession(connector=connector)
+
+async def check_jupiter_connection(session: Optional[aiohttp.ClientSession] = None):
+    """Test connection to Jupiter API (on `session`, or a session of its own)."""
+    if session is None:
+        async with _make_session() as session:
+            return await check_jupiter_connection(session)
+    
     url = "https://quote-api.jup.ag/v6/price"
     params = {
         "inputMint": "So11111111111111111111111111111111111111112",  # SOL
         "outputMint": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"  # USDC
     }
     
-    ssl_context = ssl.create_default_context()
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
-    
-    async with aiohttp.ClientSession(connector=connector) as session:
-        try:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    logger.info("✅ Jupiter API connection successful")
-                    return True
-                else:
-                    logger.error(f"❌ Jupiter API error: {response.status}")
-                    return False
-        except Exception as e:
-            logger.error(f"❌ Jupiter API connection failed: {e}")
-            return False
+    try:
+        async with session.get(url, params=params) as response:
+            if response.status == 200:
+                logger.info("✅ Jupiter API connection successful")
+                return True
+            else:
+                logger.error(f"❌ Jupiter API error: {response.status}")
+                return False
+    except Exception as e:
+        logger.error(f"❌ Jupiter API connection failed: {e}")
+        return False
 
-async def check_gaianet_connection():
-    """Test connection to GaiaNet API."""
-    url = "https://raw.gaianet.ai/llama-3-8b-instruct/config.json"
+async def check_gaianet_connection(session: Optional[aiohttp.ClientSession] = None):
+    """Test connection to GaiaNet API (on `session`, or a session of its own)."""
+    if session is None:
+        async with _make_session() as session:
+            return await check_gaianet_connection(session)
     
-    ssl_context = ssl.create_default_context()
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
+    url = "https://raw.gaianet.ai/llama-3-8b-instruct/config.json"
     
-    async with aiohttp.ClientSession(connector=connector) as session:
-        try:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    logger.info("✅ GaiaNet API connection successful")
-                    return True
-                else:
-                    logger.error(f"❌ GaiaNet API error: {response.status}")
-                    return False
-        except Exception as e:
-            logger.error(f"❌ GaiaNet API connection failed: {e}")
-            return False
+    try:
+        async with session.get(url) as response:
+            if response.status == 200:
+                logger.info("✅ GaiaNet API connection successful")
+                return True
+            else:
+                logger.error(f"❌ GaiaNet API error: {response.status}")
+                return False
+    except Exception as e:
+        logger.error(f"❌ GaiaNet API connection failed: {e}")
+        return False
 
 def check_environment():
     """Check if all required environment variables are set."""
@@ -77,10 +86,17 @@ async def main():
     """Run all environment checks."""
     logger.info("Running environment checks...")
     
+    # The two API checks are independent round-trips; run them together on one pool
+    async with _make_session() as session:
+        jupiter_ok, gaianet_ok = await asyncio.gather(
+            check_jupiter_connection(session),
+            check_gaianet_connection(session)
+        )
+    
     checks = [
         ("Environment variables", check_environment()),
-        ("Jupiter API connection", await check_jupiter_connection()),
-        ("GaiaNet API connection", await check_gaianet_connection())
+        ("Jupiter API connection", jupiter_ok),
+        ("GaiaNet API connection", gaianet_ok)
     ]
     
     all_passed = all(result for _, result in checks)
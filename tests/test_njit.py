@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from _njit import all_indicators, pct_returns
+
+
+def _both(kernel, *args):
+    """Results of the kernel as run (compiled under numba) and of its pure-Python source."""
+    return kernel(*args), getattr(kernel, 'py_func', kernel)(*args)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_all_indicators_zero_price():
+    compiled, python = _both(all_indicators, np.r_[0.0, np.arange(1, 30.)])
+    np.testing.assert_allclose(compiled, python)
+
+    # Zero momentum base: 14 bars before the last price
+    compiled, python = _both(all_indicators, np.r_[np.arange(1, 15.), 0.0, np.arange(1, 15.)])
+    assert np.isinf(compiled[3]) and np.isinf(python[3])
+    np.testing.assert_allclose(compiled, python)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_pct_returns_zero_price():
+    prices = np.array([1.0, 0.0, 2.0])
+    expected = pd.Series(prices).pct_change().dropna().to_numpy()
+    for returns in _both(pct_returns, prices):
+        np.testing.assert_array_equal(returns, expected)